@@ -0,0 +1,82 @@
+"""
+Import-time benchmark of 'import injector_api', based on 'python -X importtime'.
+Each run is a fresh interpreter; bytecode is cached in a temporary directory so that the
+numbers don't include compilation. Exits with status 1 when the median exceeds '--max-ms'.
+
+    python benchmarks/bench_import.py [--runs 10] [--max-ms 60] [--top 10] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Heavy modules that a plain 'import injector_api' must not pull in.
+DEFERRED_MODULES = ("asyncio", "concurrent.futures", "json", "logging", "inspect", "typing",
+                    "injector_api.loader", "injector_api.discovery", "injector_api.instrumentation",
+                    "injector_api.graph", "injector_api.initializer")
+
+
+def run_once(env, statement="import injector_api"):
+    """Returns {module: (self us, cumulative us)} for one interpreter run."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when the median import time is above this")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="injector_importtime_") as cache:
+        env = dict(os.environ, PYTHONPATH=ROOT, PYTHONPYCACHEPREFIX=cache)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        run_once(env)  # writes the bytecode cache
+        runs = [run_once(env) for _ in range(options.runs)]
+        loaded = subprocess.run(
+            [sys.executable, "-c", "import sys, injector_api; print('\\n'.join(sys.modules))"],
+            env=env, cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+
+    totals = [times["injector_api"][1] / 1000 for times in runs]
+    modules = {}
+    for times in runs:
+        for name, (self_us, _) in times.items():
+            modules.setdefault(name, []).append(self_us / 1000)
+    slowest = sorted(((statistics.median(values), name) for name, values in modules.items()), reverse=True)[:options.top]
+    report = {
+        "python": sys.version.split()[0],
+        "runs": options.runs,
+        "median_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "slowest_modules_ms": {name: value for value, name in slowest},
+        "unexpected_modules": [name for name in DEFERRED_MODULES if name in loaded],
+    }
+
+    if options.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import injector_api: median {report['median_ms']:.1f} ms, min {report['min_ms']:.1f} ms over {options.runs} runs")
+        for name, value in report["slowest_modules_ms"].items():
+            print(f"  {value:>8.2f} ms  {name}")
+        if report["unexpected_modules"]:
+            print("eagerly imported: " + ", ".join(report["unexpected_modules"]))
+
+    if report["unexpected_modules"] or (options.max_ms is not None and report["median_ms"] > options.max_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
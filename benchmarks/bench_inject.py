@@ -0,0 +1,92 @@
+"""
+Microbenchmark of the @inject call overhead: compiled injection plan versus the
+previous per-call wrapper and a plain function call.
+
+    python benchmarks/bench_inject.py [--number N]
+"""
+import argparse
+import inspect
+import os
+import sys
+import timeit
+from functools import wraps
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from injector_api import container, inject, SINGLETON, TRANSIENT
+
+
+class IRepository:
+    pass
+
+class Repository(IRepository):
+    pass
+
+class IClock:
+    pass
+
+class Clock(IClock):
+    pass
+
+
+def legacy_inject(interface_index_mapping=None):
+    """The wrapper as it was before injection plans: everything is recomputed on each call."""
+    if interface_index_mapping is None:
+        interface_index_mapping = {}
+
+    def decorator(func):
+        params = inspect.signature(func).parameters
+        param_names = list(params.keys())
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            is_class_method = len(args) > 0 and isinstance(args[0], type(args[0]))
+            args_list = list(args)
+            for name, param in params.items():
+                if param.annotation in container._services:
+                    index = interface_index_mapping.get(param.annotation, 0)
+                    service = container.get(param.annotation, index)
+                    if service:
+                        arg_position = param_names.index(name)
+                        if is_class_method:
+                            arg_position += 1
+                        if arg_position < len(args_list):
+                            args_list[arg_position] = service
+                        else:
+                            kwargs[name] = service
+            return func(*args_list, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def handler(request, repository: IRepository, clock: IClock):
+    return request
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200000)
+    options = parser.parse_args()
+
+    container.register(IRepository, Repository, lifecycle=SINGLETON, override=True)
+    container.register(IClock, Clock, lifecycle=TRANSIENT, override=True)
+
+    repository = Repository()
+    cases = {
+        "direct": lambda: handler(1, repository, Clock()),
+        "legacy wrapper": lambda f=legacy_inject()(handler): f(1),
+        "injection plan": lambda f=inject()(handler): f(1),
+    }
+    baseline = None
+    for name, case in cases.items():
+        case()
+        elapsed = min(timeit.repeat(case, number=options.number, repeat=5))
+        per_call = elapsed / options.number * 1e9
+        baseline = baseline or per_call
+        print(f"{name:<16} {per_call:10.1f} ns/call  {per_call / baseline:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Startup benchmark of module.py loading on a synthetic tree of N apps: cold load, and a warm
+incremental reload with nothing changed.
+
+    python benchmarks/bench_loading.py [--modules N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from injector_api import loader
+
+MODULE_TEMPLATE = '''from injector_api import container
+
+class IService{n}:
+    pass
+
+class Service{n}(IService{n}):
+    def __init__(self):
+        self.values = [value * {n} for value in range(16)]
+
+container.register(IService{n}, Service{n}, override=True)
+'''
+
+
+def generate_tree(root, modules, depth=3):
+    """Writes 'modules' apps, each with a module.py, nested 'depth' directories deep."""
+    for n in range(modules):
+        path = os.path.join(root, *(f"level{(n >> (4 * level)) % 16}" for level in range(depth - 1)), f"app{n}")
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "module.py"), "w") as f:
+            f.write(MODULE_TEMPLATE.format(n=n))
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=500)
+    options = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="injector_bench_")
+    try:
+        generate_tree(root, options.modules)
+        cases = [
+            ("cold load", lambda: loader.load_modules_from_subdirectories(root, use_cache=False), True),
+            ("warm reload", lambda: loader.load_modules_from_subdirectories(root, use_cache=False), False),
+        ]
+        for name, case, cold in cases:
+            if cold:
+                loader.LOADED_MODULES_MANIFEST.clear()
+            elapsed = timed(case)
+            print(f"{name:<14} modules={options.modules:<6} {elapsed * 1e3:9.1f} ms")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of registry lookups: the type-keyed registry of Binding records versus the
+previous registry keyed by interface.__name__ strings.
+
+    python benchmarks/bench_registry.py [--bindings N] [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from injector_api import DependencyContainer, SINGLETON, TRANSIENT
+
+
+class StringKeyedRegistry:
+    """The lookup path as it was before Binding records: string keys and tuple unpacking on every get."""
+
+    def __init__(self):
+        self._services = {}
+        self._instances = {}
+
+    def register(self, interface, implementation, lifecycle):
+        self._services.setdefault(interface.__name__, []).append((implementation, lifecycle))
+
+    def get(self, interface, index=0):
+        if interface.__name__ not in self._services:
+            raise LookupError(interface)
+        implementation, lifecycle = self._services[interface.__name__][index]
+        if lifecycle == SINGLETON:
+            if (interface.__name__, index) not in self._instances:
+                self._instances[(interface.__name__, index)] = implementation()
+            return self._instances[(interface.__name__, index)]
+        elif lifecycle == TRANSIENT:
+            return implementation()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bindings", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=200000)
+    options = parser.parse_args()
+
+    legacy, registry = StringKeyedRegistry(), DependencyContainer()
+    interfaces = []
+    for position in range(options.bindings):
+        interface = types.new_class(f"IService{position}")
+        implementation = types.new_class(f"Service{position}", (interface,))
+        lifecycle = SINGLETON if position % 2 == 0 else TRANSIENT
+        legacy.register(interface, implementation, lifecycle)
+        registry.register(interface, implementation, lifecycle=lifecycle)
+        interfaces.append(interface)
+
+    singleton, transient = interfaces[-2], interfaces[-1]
+    cases = {
+        "string-keyed singleton": lambda: legacy.get(singleton),
+        "type-keyed singleton": lambda: registry.get(singleton),
+        "string-keyed transient": lambda: legacy.get(transient),
+        "type-keyed transient": lambda: registry.get(transient),
+    }
+    for name, case in cases.items():
+        case()
+        elapsed = min(timeit.repeat(case, number=options.number, repeat=5))
+        print(f"{name:<24} {elapsed / options.number * 1e9:10.1f} ns/get")
+
+
+if __name__ == "__main__":
+    main()
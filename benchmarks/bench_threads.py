@@ -0,0 +1,73 @@
+"""
+Multi-threaded stress benchmark of singleton resolution: checks that a slow singleton
+is constructed once under a cold start and measures warm throughput per thread count.
+
+    python benchmarks/bench_threads.py [--threads 1 4 16] [--calls N]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from injector_api import DependencyContainer, SINGLETON
+
+
+class IPool:
+    pass
+
+class SlowPool(IPool):
+    constructions = 0
+
+    def __init__(self):
+        time.sleep(0.05)
+        SlowPool.constructions += 1
+
+
+def run_threads(threads, target):
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        target()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--calls", type=int, default=50000)
+    options = parser.parse_args()
+
+    for threads in options.threads:
+        container = DependencyContainer()
+        container.register(IPool, SlowPool, lifecycle=SINGLETON)
+        SlowPool.constructions = 0
+
+        cold = run_threads(threads, lambda: container.get(IPool))
+
+        def warm_calls():
+            get = container.get
+            for _ in range(options.calls):
+                get(IPool)
+
+        warm = run_threads(threads, warm_calls)
+        total = threads * options.calls
+        print(f"threads={threads:<3} constructions={SlowPool.constructions} "
+              f"cold={cold * 1e3:7.1f} ms  warm={total / warm:12.0f} gets/s  "
+              f"{warm / total * 1e9:8.1f} ns/get")
+        if SlowPool.constructions != 1:
+            sys.exit(f"duplicate construction with {threads} threads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Synthetic dependency graphs and package trees for the benchmarks."""
+import importlib
+import inspect
+import os
+import random
+import sys
+import types
+
+from injector_api import SINGLETON, TRANSIENT, SCOPED
+
+
+def make_graph(container, bindings, fanout=2, lifecycles=(SINGLETON, TRANSIENT, SCOPED), seed=0):
+    """
+    Registers 'bindings' interfaces in the container. Each implementation takes up to 'fanout'
+    constructor dependencies on interfaces registered before it, so the graph is acyclic.
+    Returns the list of interfaces, in registration order.
+    """
+    rng = random.Random(seed)
+    interfaces = []
+    for position in range(bindings):
+        interface = types.new_class(f"IGenerated{position}")
+        dependencies = rng.sample(interfaces, min(fanout, len(interfaces)))
+        names = [f"dependency{n}" for n in range(len(dependencies))]
+
+        def __init__(self, *args, **kwargs):
+            self.dependencies = kwargs
+
+        __init__.__signature__ = _signature(names, dependencies)
+        implementation = types.new_class(f"Generated{position}", (interface,), exec_body=lambda ns: ns.update(__init__=__init__))
+        container.register(interface, implementation, lifecycle=lifecycles[position % len(lifecycles)])
+        interfaces.append(interface)
+    return interfaces
+
+
+def _signature(names, annotations):
+    parameters = [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    parameters += [inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=annotation)
+                   for name, annotation in zip(names, annotations)]
+    return inspect.Signature(parameters)
+
+
+def make_package(root, modules, classes_per_module=4, package_name=None):
+    """
+    Writes an importable package under 'root' with 'modules' modules spread over subpackages.
+    Every module defines 'classes_per_module' classes; one of them implements 'IBenchService'
+    from the package's 'interfaces' module. Returns (package module, interface class).
+    """
+    package_name = package_name or f"benchpkg_{modules}_{os.getpid()}"
+    package_dir = os.path.join(root, package_name)
+    os.makedirs(package_dir, exist_ok=True)
+    open(os.path.join(package_dir, "__init__.py"), "w").close()
+    with open(os.path.join(package_dir, "interfaces.py"), "w") as f:
+        f.write("class IBenchService:\n    pass\n")
+
+    for n in range(modules):
+        subpackage = os.path.join(package_dir, f"group{n // 50}")
+        if not os.path.exists(subpackage):
+            os.makedirs(subpackage)
+            open(os.path.join(subpackage, "__init__.py"), "w").close()
+        lines = [f"from {package_name}.interfaces import IBenchService\n"]
+        lines.append(f"class Service{n}(IBenchService):\n    pass\n")
+        lines += [f"class Helper{n}_{c}:\n    pass\n" for c in range(classes_per_module - 1)]
+        with open(os.path.join(subpackage, f"module{n}.py"), "w") as f:
+            f.write("\n".join(lines))
+
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    importlib.invalidate_caches()
+    package = importlib.import_module(package_name)
+    return package, importlib.import_module(package_name + ".interfaces").IBenchService
@@ -0,0 +1,195 @@
+"""
+Reproducible benchmark suite for the hot paths of injector_api:
+
+    get             container.get per lifecycle, for registries of 10 to 10k bindings
+    inject          @inject call overhead versus a direct call
+    scope           start_scope / scoped get / end_scope cycles
+    register_name   register(implementation_name=...) as the package tree grows
+    threads         warm singleton gets from 1 to 64 threads
+
+Results are written as JSON so regressions can be compared across releases:
+
+    python benchmarks/suite.py --output bench.json [--quick] [--only get inject]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import injector_api
+from injector_api import DependencyContainer, inject, container as global_container, SINGLETON, TRANSIENT, SCOPED
+
+from generators import make_graph, make_package
+
+
+def measure(function, number, repeat=5):
+    """Returns the best time per call, in nanoseconds, over 'repeat' runs of 'number' calls."""
+    function()
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e9
+
+
+def bench_get(options):
+    results = []
+    for size in options.sizes:
+        container = DependencyContainer()
+        interfaces = make_graph(container, size, fanout=2)
+        container.start_scope()
+        for lifecycle in (SINGLETON, TRANSIENT, SCOPED):
+            interface = next(interface for interface in reversed(interfaces)
+                             if container._services[interface][0].lifecycle == lifecycle)
+            results.append({
+                "bindings": size,
+                "lifecycle": lifecycle,
+                "ns_per_op": measure(lambda: container.get(interface), options.number),
+            })
+        container.end_scope()
+    return results
+
+
+class IBenchRepository:
+    pass
+
+class BenchRepository(IBenchRepository):
+    pass
+
+class IBenchClock:
+    pass
+
+class BenchClock(IBenchClock):
+    pass
+
+
+def bench_inject(options):
+    global_container.register(IBenchRepository, BenchRepository, override=True)
+    global_container.register(IBenchClock, BenchClock, lifecycle=TRANSIENT, override=True)
+    repository = global_container.get(IBenchRepository)
+
+    def handler(request, repository: IBenchRepository, clock: IBenchClock):
+        return request
+
+    injected = inject(handler)
+    direct = measure(lambda: handler(1, repository, BenchClock()), options.number)
+    wrapped = measure(lambda: injected(1), options.number)
+    return [
+        {"case": "direct", "ns_per_op": direct},
+        {"case": "inject", "ns_per_op": wrapped, "overhead_ns": wrapped - direct},
+    ]
+
+
+def bench_scope(options):
+    container = DependencyContainer()
+    interfaces = make_graph(container, 30, fanout=2, lifecycles=(SCOPED, TRANSIENT))
+    scoped = [interface for interface in interfaces if container._services[interface][0].lifecycle == SCOPED][-5:]
+
+    def cycle():
+        container.start_scope()
+        for interface in scoped:
+            container.get(interface)
+        container.end_scope()
+
+    return [{"scoped_services": len(scoped), "ns_per_op": measure(cycle, max(options.number // 20, 1))}]
+
+
+def bench_register_name(options):
+    results = []
+    root = tempfile.mkdtemp(prefix="injector_bench_")
+    try:
+        for modules in options.package_sizes:
+            package, interface = make_package(root, modules)
+
+            def register():
+                container = DependencyContainer()
+                container.register_module(package)
+                for n in range(0, modules, max(modules // 10, 1)):
+                    container.register(interface, implementation_name=f"Service{n}", override=True)
+
+            start = time.perf_counter()
+            register()
+            elapsed = time.perf_counter() - start
+            results.append({"modules": modules, "registrations": len(range(0, modules, max(modules // 10, 1))),
+                             "seconds": elapsed})
+    finally:
+        shutil.rmtree(root)
+    return results
+
+
+def bench_threads(options):
+    results = []
+    container = DependencyContainer()
+    interfaces = make_graph(container, 10, fanout=2, lifecycles=(SINGLETON,))
+    interface = interfaces[-1]
+    container.get(interface)
+    calls = max(options.number // 4, 1)
+    for threads in options.threads:
+        barrier = threading.Barrier(threads)
+
+        def worker():
+            get = container.get
+            barrier.wait()
+            for _ in range(calls):
+                get(interface)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        results.append({"threads": threads, "ns_per_op": elapsed / (threads * calls) * 1e9,
+                        "ops_per_second": threads * calls / elapsed})
+    return results
+
+
+BENCHMARKS = {
+    "get": bench_get,
+    "inject": bench_inject,
+    "scope": bench_scope,
+    "register_name": bench_register_name,
+    "threads": bench_threads,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="JSON file to write; defaults to stdout")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--number", type=int, default=100000, help="calls per timing run")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--package-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--quick", action="store_true", help="small sizes, for smoke runs")
+    options = parser.parse_args()
+    if options.quick:
+        options.number, options.sizes, options.package_sizes, options.threads = 2000, [10, 100], [10], [1, 4]
+
+    report = {
+        "version": injector_api.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": {},
+    }
+    for name in options.only or BENCHMARKS:
+        print(f"running {name}...", file=sys.stderr)
+        report["results"][name] = BENCHMARKS[name](options)
+
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
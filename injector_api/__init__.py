@@ -1,5 +1,33 @@
-from .container import DependencyContainer, SINGLETON, TRANSIENT, SCOPED, container
-from .loader import inject,load_modules_from_subdirectories,initializate
-from .scopeMiddleware import ScopeMiddleware ,ScoperMiddlewareManual
+from .container import DependencyContainer, SINGLETON, TRANSIENT, SCOPED, POOLED, MEMOIZED, container
 
-__version__ = '0.5.0'
\ No newline at end of file
+__version__ = '0.5.0'
+
+# The loader, the middlewares and the executor are imported on first access, so that
+# 'import injector_api' only pays for the container.
+_LAZY_ATTRIBUTES = {
+    'inject': 'loader',
+    'load_modules_from_subdirectories': 'loader',
+    'initializate': 'loader',
+    'load_wiring': 'loader',
+    'ScopeMiddleware': 'scopeMiddleware',
+    'ScoperMiddlewareManual': 'scopeMiddleware',
+    'AsyncScopeMiddleware': 'scopeMiddleware',
+    'AsyncScoperMiddlewareManual': 'scopeMiddleware',
+    'ScopedExecutor': 'executor',
+}
+
+__all__ = ['DependencyContainer', 'SINGLETON', 'TRANSIENT', 'SCOPED', 'POOLED', 'MEMOIZED', 'container'] + list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,71 @@
+"""
+Command line tools of injector_api.
+
+    python -m injector_api graph [DIRECTORY] [--wiring PATH] [--format text|json|dot] [--output FILE] [--measure]
+
+'graph' loads the module.py files of DIRECTORY (by default the application directory of
+injectorConfig.json) or a generated wiring module, and prints the dependency graph. With
+'--measure' every eager singleton is built under the instrumentation first, so the graph carries
+construction times and the critical path of eager initialisation.
+"""
+import argparse
+import os
+import sys
+
+from . import loader
+from .container import container
+
+
+def build_eager_singletons(target):
+    """Builds every eager singleton of the container; returns the errors as (binding, exception)."""
+    graph = target.dependency_graph()
+    errors = []
+    for binding in graph.bindings:
+        if graph.eager(binding):
+            try:
+                target.get(binding.interface, binding.key if binding.key is not None else binding.index)
+            except Exception as error:
+                errors.append((binding, error))
+    return errors
+
+
+def graph_command(options):
+    if options.measure:
+        container.enable_instrumentation()
+    if options.wiring is not None:
+        loader.load_wiring(options.wiring)
+    else:
+        directory = options.directory or os.path.join(loader.get_parent_directory(), loader.get_module_application())
+        loader.load_modules_from_subdirectories(directory, use_cache=False)
+    if options.measure:
+        for binding, error in build_eager_singletons(container):
+            print(f"could not build {binding!r}: {error}", file=sys.stderr)
+
+    graph = container.dependency_graph()
+    text = {"text": graph.report, "json": graph.to_json, "dot": graph.to_dot}[options.format]()
+    if options.output is not None:
+        with open(options.output, 'w') as file:
+            file.write(text)
+    else:
+        print(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m injector_api", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    graph = commands.add_parser("graph", help="export the dependency graph and the startup critical path")
+    graph.add_argument("directory", nargs="?", help="directory searched for module.py files")
+    graph.add_argument("--wiring", help="load a module generated with container.export_wiring instead")
+    graph.add_argument("--format", choices=("text", "json", "dot"), default="text")
+    graph.add_argument("--output", help="write to this file instead of the standard output")
+    graph.add_argument("--measure", action="store_true", help="build the eager singletons and record their construction times")
+    options = parser.parse_args(argv)
+    if options.command != "graph":
+        parser.print_help()
+        return 2
+    graph_command(options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
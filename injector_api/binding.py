@@ -0,0 +1,148 @@
+import sys
+import types
+
+# 'inspect' and 'typing' are imported where they are used: they are only needed to read
+# constructor signatures, and they make up most of the import time of the package otherwise.
+_NONE_TYPE = type(None)
+_UNION_TYPE = getattr(types, 'UnionType', None)
+
+
+class Binding:
+    """
+        Registration record of one implementation of an interface.
+        Bindings are hashable by identity and are used directly as keys of the instance caches.
+    """
+    __slots__ = ('interface', 'implementation', 'lifecycle', 'index', 'pool', 'lazy', 'fork_safe', 'key', 'cache')
+
+    def __init__(self, interface, implementation, lifecycle, index, pool=None, lazy=False, fork_safe=True, key=None, cache=None):
+        self.interface = interface
+        self.implementation = implementation
+        self.lifecycle = lifecycle
+        self.index = index
+        self.pool = pool
+        self.lazy = lazy
+        self.fork_safe = fork_safe
+        self.key = key
+        self.cache = cache
+
+    @property
+    def name(self):
+        """Readable name of the interface, also for tuples of classes."""
+        return interface_name(self.interface)
+
+    def __repr__(self):
+        qualifier = repr(self.key) if self.key is not None else self.index
+        return f"Binding({self.name}[{qualifier}] -> {getattr(self.implementation, '__name__', self.implementation)}, {self.lifecycle})"
+
+
+class InstanceProvider:
+    """
+        Implementation of a binding registered with 'register_instance': calling it returns the
+        instance. Providers of the same object are equal, so reloading a module that registers an
+        unchanged instance keeps its binding.
+    """
+    __slots__ = ('instance',)
+
+    def __init__(self, instance):
+        self.instance = instance
+
+    def __call__(self):
+        return self.instance
+
+    def __eq__(self, other):
+        return isinstance(other, InstanceProvider) and other.instance is self.instance
+
+    def __hash__(self):
+        return id(self.instance)
+
+    def __repr__(self):
+        return f"InstanceProvider({self.instance!r})"
+
+
+def interface_name(interface):
+    """Returns the name used in messages for an interface or a tuple of interfaces."""
+    if isinstance(interface, tuple):
+        return '(' + ', '.join(interface_name(item) for item in interface) + ')'
+    return getattr(interface, '__name__', repr(interface))
+
+
+def injection_target(annotation):
+    """
+        Reduces a type hint to the interface it asks for: Optional[X] and Union[X, None] become X,
+        and Annotated[X, ...] becomes X. Returns None when nothing injectable is left.
+    """
+    import inspect
+    import typing
+    if annotation is inspect.Parameter.empty or isinstance(annotation, str):
+        return None
+    origin = getattr(annotation, '__origin__', None)
+    if getattr(annotation, '__metadata__', None) is not None:
+        return injection_target(origin)
+    if origin is typing.Union or (_UNION_TYPE is not None and isinstance(annotation, _UNION_TYPE)):
+        members = [member for member in annotation.__args__ if member is not _NONE_TYPE]
+        return injection_target(members[0]) if len(members) == 1 else None
+    if isinstance(annotation, type):
+        return annotation
+    return None
+
+
+def injection_key(annotation):
+    """
+        Returns the key that qualifies a hint such as Annotated[X, "redis"] (also inside Optional),
+        or None when the hint carries no string metadata.
+    """
+    import inspect
+    import typing
+    if annotation is inspect.Parameter.empty or isinstance(annotation, str):
+        return None
+    metadata = getattr(annotation, '__metadata__', None)
+    if metadata is not None:
+        return next((item for item in metadata if isinstance(item, str)), None)
+    origin = getattr(annotation, '__origin__', None)
+    if origin is typing.Union or (_UNION_TYPE is not None and isinstance(annotation, _UNION_TYPE)):
+        members = [member for member in annotation.__args__ if member is not _NONE_TYPE]
+        return injection_key(members[0]) if len(members) == 1 else None
+    return None
+
+
+def _type_hints(func):
+    """Returns the evaluated type hints of a function or of a class constructor, or {} if they can't be evaluated."""
+    import inspect
+    import typing
+    target = func.__init__ if isinstance(func, type) else func
+    target = inspect.unwrap(target)
+    try:
+        if hasattr(typing, 'Annotated'):
+            return typing.get_type_hints(target, include_extras=True)
+        return typing.get_type_hints(target)
+    except Exception:
+        return {}
+
+
+def injectable_parameters(func):
+    """
+        Returns (position, name, annotation) for every parameter of 'func' that can receive an injected service.
+        String annotations (forward references, 'from __future__ import annotations') are evaluated.
+        Keyword-only parameters get the position sys.maxsize, so they are never filled positionally.
+    """
+    import inspect
+    candidates = []
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return candidates
+    hints = None
+    for position, (name, param) in enumerate(parameters.items()):
+        if param.kind == param.POSITIONAL_OR_KEYWORD:
+            pass
+        elif param.kind == param.KEYWORD_ONLY:
+            position = sys.maxsize
+        else:
+            continue
+        annotation = param.annotation
+        if isinstance(annotation, str):
+            if hints is None:
+                hints = _type_hints(func)
+            annotation = hints.get(name, annotation)
+        candidates.append((position, name, annotation))
+    return candidates
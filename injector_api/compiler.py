@@ -0,0 +1,106 @@
+import importlib.util
+import os
+
+from .dependencyError import ConfigurationError
+from .binding import InstanceProvider, interface_name
+
+WIRING_HEADER = '''"""
+Wiring generated by injector_api.
+Importing this module and calling register(container) recreates the registrations
+without running module.py files or scanning packages. Do not edit by hand.
+"""
+'''
+
+
+def _import_path(obj):
+    """Returns (module, qualified name) for an object that can be imported back, or None."""
+    module = getattr(obj, '__module__', None)
+    qualname = getattr(obj, '__qualname__', None)
+    if not module or not qualname or '<' in qualname or module == '__main__':
+        return None
+    try:
+        spec = importlib.util.find_spec(module.split('.')[0])
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return None
+    return module, qualname
+
+
+def generate_wiring(container):
+    """Returns the source of a Python module that recreates the registrations of the container."""
+    instances = sorted(interface_name(binding.interface) for bindings in container._services.values()
+                       for binding in bindings if isinstance(binding.implementation, InstanceProvider))
+    if instances:
+        raise ConfigurationError(
+            f"Dependency error: cannot export the wiring, these interfaces are bound with register_instance: "
+            f"{', '.join(instances)}. Instances are runtime objects; register a factory that builds them instead."
+        )
+
+    imports = {}
+    lines = []
+    unresolved = []
+
+    def reference(obj):
+        path = _import_path(obj)
+        if path is None:
+            unresolved.append(obj)
+            return None
+        if path not in imports:
+            imports[path] = f"_ref{len(imports)}"
+        return imports[path]
+
+    for interface, bindings in container._services.items():
+        interface_ref = reference(interface)
+        for binding in bindings:
+            implementation_ref = reference(binding.implementation)
+            if interface_ref is None or implementation_ref is None:
+                continue
+            method = 'register' if isinstance(binding.implementation, type) else 'register_factory'
+            options = f"lifecycle={binding.lifecycle!r}, override=True"
+            if binding.pool is not None:
+                options += f", pool_size={binding.pool.size!r}"
+            if binding.lazy:
+                options += ", lazy=True"
+            if binding.cache is not None:
+                options += f", cache_size={binding.cache.size!r}, ttl={binding.cache.ttl!r}"
+            if binding.key is not None:
+                options += f", key={binding.key!r}"
+            if not binding.fork_safe:
+                options += ", fork_safe=False"
+            lines.append(f"    container.{method}({interface_ref}, {implementation_ref}, {options})")
+
+    if unresolved:
+        names = ', '.join(sorted(set(interface_name(obj) for obj in unresolved)))
+        raise ConfigurationError(
+            f"Dependency error: cannot export the wiring, these objects can't be imported by name: {names}. "
+            f"Define them in an importable module instead of module.py or '__main__'."
+        )
+
+    source = [WIRING_HEADER]
+    for (module, qualname), alias in imports.items():
+        head, _, rest = qualname.partition('.')
+        source.append(f"from {module} import {head} as {alias}" if not rest else
+                      f"from {module} import {head} as {alias}_owner\n{alias} = {alias}_owner.{rest}")
+    source.append("\n\ndef register(container):")
+    source.extend(lines or ["    pass"])
+    return '\n'.join(source) + '\n'
+
+
+def write_wiring(container, path):
+    """Writes the generated wiring module of the container to 'path'."""
+    source = generate_wiring(container)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(source)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_wiring(path, container):
+    """Imports a generated wiring module and registers its bindings in the container."""
+    spec = importlib.util.spec_from_file_location("injector_api_wiring", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.register(container)
+    return module
@@ -1,48 +1,374 @@
 import threading
-from .dependencyError import *
-import pkgutil
-import importlib
+import contextvars
+import itertools
+import collections
+import functools
+import time
 import os
+import weakref
+from types import MappingProxyType
+from .dependencyError import *
+from .binding import Binding, InstanceProvider, injectable_parameters, injection_key, injection_target, interface_name
+from .lazy import LazyProxy
 import sys
 
 # Lifecycle constants for services
 SINGLETON = 'singleton'
 TRANSIENT = 'transient'
 SCOPED = 'scoped'
+POOLED = 'pooled'
+MEMOIZED = 'memoized'
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CACHE_SIZE = 128
+
+_MISSING = object()
+_NO_INSTANCES = MappingProxyType({})
+
+
+def _dispose(instance):
+    """Releases the resources of an instance through close() or __exit__, when it has one."""
+    close = getattr(instance, 'close', None)
+    if callable(close):
+        close()
+        return
+    exit_ = getattr(instance, '__exit__', None)
+    if callable(exit_):
+        exit_(None, None, None)
+
+
+async def _adispose(instance):
+    """Asynchronous counterpart of '_dispose' that prefers aclose() and __aexit__."""
+    aclose = getattr(instance, 'aclose', None)
+    if callable(aclose):
+        await aclose()
+        return
+    aexit = getattr(instance, '__aexit__', None)
+    if callable(aexit):
+        await aexit(None, None, None)
+        return
+    _dispose(instance)
+
+
+class InstancePool:
+    """
+        Bounded pool of instances of a POOLED service. Instances are reset with their reset()
+        method, when they have one, before they are handed to the next scope.
+    """
+    __slots__ = ('size', '_idle', '_lock')
+
+    def __init__(self, size=DEFAULT_POOL_SIZE):
+        self.size = size
+        self._idle = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Returns an idle instance or _MISSING if the pool is empty."""
+        try:
+            return self._idle.pop()
+        except IndexError:
+            return _MISSING
+
+    def release(self, instance):
+        """Resets the instance and keeps it for reuse. Returns False if it has to be disposed instead."""
+        reset = getattr(instance, 'reset', None)
+        if callable(reset):
+            try:
+                reset()
+            except Exception:
+                return False
+        with self._lock:
+            if len(self._idle) >= self.size:
+                return False
+            self._idle.append(instance)
+        return True
+
+
+class MemoCache:
+    """
+        Bounded cache of the instances of a MEMOIZED service, keyed by the arguments passed to 'get'.
+        Beyond 'size' entries the least recently used one is evicted, and entries older than 'ttl'
+        seconds are built again. Evicted instances are not disposed, since callers may still use them.
+    """
+    __slots__ = ('size', 'ttl', '_entries', '_lock')
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE, ttl=None):
+        self.size = size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(args, kwargs):
+        """Returns the cache key of the arguments of a call to 'get'."""
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        try:
+            hash(key)
+        except TypeError:
+            raise ConfigurationError(f"Dependency error: the arguments of a MEMOIZED service must be hashable, got {args!r} {kwargs!r}") from None
+        return key
+
+    def get(self, key):
+        """Returns the live instance cached under 'key' or _MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            instance, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return instance
+
+    def put(self, key, instance):
+        """Caches the instance under 'key', evicting the least recently used entries beyond 'size'."""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (instance, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return instance
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
 
 class ScopeManager:
     """
         Manages the current "scope" for services with a SCOPED lifecycle.
-        Uses thread-specific local storage to keep track of the current scope.
+        The scope is kept in a context variable, so every thread and every asyncio task
+        has its own current scope.
     """
     
     def __init__(self):
-        self._local_storage = threading.local()
+        self._current_scope = contextvars.ContextVar('injector_api_scope', default=None)
     
-    def set_current_scope(self, scope_id):
+    def set_current_scope(self, scope):
         """Sets the current scope."""
-        self._local_storage.scope_id = scope_id
+        self._current_scope.set(scope)
         
     def get_current_scope(self):
-        """Returns the current active scope or None if no scope is active."""
-        return getattr(self._local_storage, 'scope_id', None)
+        """Returns the current active Scope or None if no scope is active."""
+        return self._current_scope.get()
 
 scope_manager = ScopeManager()
+_scope_ids = itertools.count(1)
+_containers = weakref.WeakSet()
+_live_scopes = weakref.WeakSet()
+RECENT_LEAKS = 64
+
+
+class ScopeLeaks:
+    """Scopes that were garbage collected without being closed, kept for 'scope_diagnostics'."""
+
+    def __init__(self):
+        self.count = 0
+        self.recent = collections.deque(maxlen=RECENT_LEAKS)
+
+    def record(self, scope):
+        self.count += 1
+        self.recent.append({"id": scope.id, "age": time.monotonic() - scope.created, "instances": len(scope.instances)})
+
+_scope_leaks = ScopeLeaks()
+
+
+class Scope:
+    """
+        Owns the instances of SCOPED and POOLED services for a unit of work, usually one request.
+        As a context manager (sync or async) it becomes the current scope on entry; on exit its
+        instances are disposed and the previous scope is restored. A nested scope reuses the
+        instances its parents already hold and builds the others itself. Only the contexts that
+        run a scope reference it, so a scope that is never closed is garbage collected together
+        with its instances and counted as a leak.
+    """
+    __slots__ = ('id', 'parent', 'instances', 'closed', 'created', '_container', '_lock', '_token', '__weakref__')
+
+    def __init__(self, container, parent=None):
+        self.id = next(_scope_ids)
+        self.parent = parent
+        self.instances = {}
+        self.closed = False
+        self.created = time.monotonic()
+        self._container = container
+        # Guards the creation of the scope's instances; reentrant, since a scoped service may
+        # depend on other scoped services.
+        self._lock = threading.RLock()
+        self._token = None
+        _live_scopes.add(self)
+
+    def find(self, binding):
+        """Returns the instance of the binding held by this scope or one of its parents, or _MISSING."""
+        scope = self
+        while scope is not None:
+            instance = scope.instances.get(binding, _MISSING)
+            if instance is not _MISSING:
+                return instance
+            scope = scope.parent
+        return _MISSING
+
+    def retained_bytes(self):
+        """Shallow estimate of the memory held by the instances of the scope, in bytes."""
+        total = sys.getsizeof(self.instances)
+        for instance in list(self.instances.values()):
+            total += sys.getsizeof(instance) + sys.getsizeof(getattr(instance, '__dict__', None))
+        return total
+
+    def run(self, fn, *args, **kwargs):
+        """Calls 'fn' with this scope as the current scope, from any thread, then restores the previous one."""
+        token = scope_manager._current_scope.set(self)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            scope_manager._current_scope.reset(token)
+
+    def close(self):
+        """Disposes the instances of the scope in reverse creation order."""
+        self._container._dispose_scope(self)
+
+    async def aclose(self):
+        """Asynchronous counterpart of 'close' that also awaits aclose() and __aexit__."""
+        await self._container._adispose_scope(self)
+
+    def __enter__(self):
+        self._token = scope_manager._current_scope.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self.close()
+        finally:
+            self._restore()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info):
+        try:
+            await self.aclose()
+        finally:
+            self._restore()
+
+    def _restore(self):
+        token, self._token = self._token, None
+        if token is None:
+            return
+        try:
+            scope_manager._current_scope.reset(token)
+        except ValueError:
+            # Exited from another context than the one that entered it.
+            scope_manager.set_current_scope(self.parent)
+
+    def __del__(self):
+        try:
+            if not self.closed and self.instances:
+                _scope_leaks.record(self)
+        except Exception:
+            pass
+
+    def __repr__(self):
+        return f"Scope({self.id}, parent={self.parent.id if self.parent is not None else None}, instances={len(self.instances)})"
+
+
+def _reset_containers_after_fork():
+    """Runs in the child process after a fork: resets the state of every live container."""
+    scope_manager.set_current_scope(None)
+    for container in list(_containers):
+        container.reset_after_fork()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_containers_after_fork)
 
 class DependencyContainer:
     """
     Main container that handles the registration and retrieval of services.
+    A container created with 'parent' (see 'child') sees the registry of its parent and shares
+    its instances; its own registrations are layered on top without touching the parent.
     """
-    def __init__(self) -> None:
-        self._services = {}
+    def __init__(self, parent=None) -> None:
+        self._parent = parent
+        self._own_services = {}
+        self._own_keys = {}
+        self._children = weakref.WeakSet()
+        # Private copies of inherited bindings that depend on overrides: {original: shadow} and
+        # {shadow: the bindings its dependencies resolved to when it was made}.
+        self._shadows = {}
+        self._shadow_bindings = {}
+        self._override_dependents = {}
         self.__instances = {}
-        self.__scoped_instances = {}
-        self.__module =None
+        # module.py file each binding was registered from. The file being executed and the
+        # registrations staged by a reload are per thread, so other threads keep registering normally.
+        self._sources = {}
+        self._registering = threading.local()
+        if parent is None:
+            self._services = self._own_services
+            self._keys = self._own_keys
+            self.__module =None
+            self.__discovery_index = None
+            self.__index_path = None
+            self._dependency_graph = {}
+        else:
+            self._services = parent._services
+            self._keys = parent._keys
+            self.__module = parent.__module
+            self.__discovery_index = parent.__discovery_index
+            self.__index_path = parent.__index_path
+            # Constructor signatures don't depend on the registry, so the parsed graph is shared.
+            self._dependency_graph = parent._dependency_graph
+            parent._children.add(self)
+        self._resolvers = {}
+        self._lazy_resolvers = {}
+        self._factories = {}
+        self._async_dependencies = {}
+        self._bundles = {}
+        self._groups = {}
+        self._version = 0
+        self._table = None
+        self._keyed_table = None
+        self._instrumentation = None
+        self.__locks = {}
+        self.__locks_guard = threading.Lock()
+        self.__pending = {}
+        _containers.add(self)
+
 
+    def child(self):
+        """
+            Returns a child container. It resolves everything registered here, now or later, and
+            shares the instances of those registrations; what is registered in the child only
+            applies to the child. A service whose dependencies are overridden in the child is built
+            again for the child. Children are cheap enough to create per test, tenant or request.
+        """
+        return DependencyContainer(parent=self)
 
-    def register_module(self,module)->None:
-        """Registers a module for the container."""
+    @property
+    def parent(self):
+        """The container this one was created from with 'child', or None."""
+        return self._parent
+
+    def register_module(self,module, index_path=None)->None:
+        """
+            Registers a module for the container. If 'index_path' is given, the class-discovery
+            index is persisted there and reused on the next start.
+        """
         self.__module = module
+        self.__index_path = index_path
+        self.__discovery_index = None
+
+    @property
+    def discovery_index(self):
+        """Returns the class-discovery index of the registered module, building it on first use."""
+        if self.__discovery_index is None:
+            if self.__module is None:
+                raise ConfigurationError(f"No register module for apps")
+            from .discovery import DiscoveryIndex
+            self.__discovery_index = DiscoveryIndex(self.__module, cache_path=self.__index_path)
+        return self.__discovery_index.build()
 
     def is_valid_class_or_tuple(self,item):
         """Checks if the item is a class or a tuple of classes."""
@@ -52,84 +378,33 @@ class DependencyContainer:
             return True
         return False
     
-    def module_contains_interface(self,module_path, interface_name):
-        """Checks if a module contains a reference to the interface name without importing it."""
-        with open(module_path, 'r') as f:
-            content = f.read()
-            return interface_name in content
-        
-    def module_does_not_contain_container(self,module_path):
-        """Checks if a module doesn't contain any reference to the term 'container'."""
-        with open(module_path, 'r') as f:
-            content = f.read()
-            return 'container' not in content
-
     def find_classes_in_package_recursive(self,package, interface):
-        """Finds classes in a package and its subpackages that match the given interface."""
-        matches_set = set()
-        imported_modules = set()
-        class_lengths = {}
-
-
-        # Verificar que el argumento 'interface' es válido
+        """
+            Finds classes in a package and its subpackages that match the given interface.
+            The package is scanned statically and only the modules defining candidates are imported.
+        """
         if not self.is_valid_class_or_tuple(interface):
             raise ValueError("The provided interface must be a class or a tuple of classes")
-        
-        def _find_classes_in_module(module, interface):
-            for attr_name in dir(module):
-                attr_value = getattr(module, attr_name)
-                
-                if self.is_valid_class_or_tuple(attr_value) and issubclass(attr_value, interface) and attr_value != interface:
-                    class_key = attr_value.__name__  # Usamos solo el nombre de la clase como clave
-                    
-                    # Si la clase aún no está en nuestro diccionario de longitudes
-                    if class_key not in class_lengths:
-                        class_lengths[class_key] = (len(f"{attr_value.__module__}.{attr_value.__name__}"), attr_value)
-                        matches_set.add(attr_value)
-                    
-                    else:
-                        # Si la clase está en el diccionario, comparamos las longitudes y verificamos si son la misma clase
-                        current_length, current_class = class_lengths[class_key]
-                        
-                        if len(f"{attr_value.__module__}.{attr_value.__name__}") > current_length:
-                            # Si la nueva clase tiene una ruta más larga y es la misma clase, la reemplazamos
-                            if current_class == attr_value:
-                                matches_set.remove(current_class)
-                                matches_set.add(attr_value)
-                                class_lengths[class_key] = (len(f"{attr_value.__module__}.{attr_value.__name__}"), attr_value)
-                            
-                            # Si las clases no son las mismas, las tratamos como diferentes y las agregamos ambas
-                            elif current_class != attr_value:
-                                matches_set.add(attr_value)
-        
-       
-        
-        def _recursive_search(package, interface):
-            for loader, module_name, is_pkg in pkgutil.walk_packages(package.__path__):
-                full_name = package.__name__ + '.' + module_name
-                if full_name in imported_modules:
-                    continue
-
-                imported_modules.add(full_name)
-                module_path = os.path.join(package.__path__[0], module_name + '.py')
-                if is_pkg:
-                    _recursive_search(importlib.import_module(full_name), interface)
-                elif self.module_contains_interface(module_path, interface.__name__ if isinstance(interface, type) else interface[0].__name__) and self.module_does_not_contain_container(module_path):
-                    current_script_name = sys.argv[0].replace("/", ".").replace("\\", ".").rstrip(".py")
-                    
-                    if full_name != current_script_name and full_name != package.__name__ + '.'+current_script_name :
-                        module = importlib.import_module(full_name)
-                        _find_classes_in_module(module, interface)
-            
 
-        _recursive_search(package, interface)
-        return list(matches_set)
+        if self.__module is package:
+            index = self.discovery_index
+        else:
+            from .discovery import DiscoveryIndex
+            index = DiscoveryIndex(package)
+        return index.find_subclasses(interface)
 
 
-    def register(self,interface, implementation=None,implementation_name=None, lifecycle=SINGLETON, override=False):
+    def register(self,interface, implementation=None,implementation_name=None, lifecycle=SINGLETON, override=False, pool_size=DEFAULT_POOL_SIZE, lazy=False, fork_safe=True, key=None,
+                 cache_size=DEFAULT_CACHE_SIZE, ttl=None):
         """
             Registers an implementation for a given interface. If an implementation is already registered,
-            it can be overridden with the 'override' flag.
+            it can be overridden with the 'override' flag. A 'key' qualifies the implementation, so several
+            keyed implementations of one interface can coexist; they are resolved with get(interface, key)
+            or Annotated[interface, key] hints. 'pool_size' bounds the idle instances kept
+            for a POOLED lifecycle. A 'lazy' singleton is injected as a LazyProxy until it is first used.
+            Instances registered with 'fork_safe=False' (connections, threads, locks) are dropped in
+            forked child processes and built again there. A MEMOIZED service caches one instance per
+            distinct 'get' arguments, at most 'cache_size' of them and for 'ttl' seconds if given.
         """
         
         if not implementation and not implementation_name:
@@ -148,97 +423,1031 @@ class DependencyContainer:
                 raise ConfigurationError(f"No register module for apps")
             
             
-            # Aquí intentamos encontrar las clases usando la función
-            count_match = 0
-            matches = self.find_classes_in_package_recursive(self.__module, interface)
-            for match in matches:
-                if match.__name__ == implementation_name:
-                    count_match += 1
-                    
-                    
-           
+            if not self.is_valid_class_or_tuple(interface):
+                raise ValueError("The provided interface must be a class or a tuple of classes")
+
+            matches = self.discovery_index.find(interface, implementation_name)
             if not matches:
                 raise ConfigurationError(f"No class named '{implementation_name}' found.")
-            elif len(matches) > 1 and count_match >= 2:
-                
-                # Aquí puedes decidir qué hacer si hay múltiples coincidencias. Por ejemplo:
+            elif len(matches) > 1:
                 raise ConfigurationError(f"Multiple classes named '{implementation_name,matches}' found. Please specify module.")
-            else:
-                if len(matches) > 1:
-                    found_exact_match = False
-                    for match in matches:
-                        class_key = f"{match.__module__}.{match.__name__}"
-                        class_key = class_key.split('.')[-1]
-                        if class_key == implementation_name:
-                            implementation = match
-                            found_exact_match = True
-                            break
-                    if not found_exact_match:
-                        raise ConfigurationError(f"Multiple matches found for '{implementation_name}', but no exact match for provided implementation name. Please specify a unique class name or check your imports.")
-                else:
-                    implementation = matches[0]
-                
-        
+            implementation = matches[0]
 
         if not issubclass(implementation, interface):
             raise ConfigurationError(f'Dependency error: {implementation} is not a subclass of {interface}')
-        if interface.__name__ in self._services and not override:
+        self._add_binding(interface, implementation, lifecycle, override, pool_size, lazy, fork_safe, key, cache_size, ttl)
+
+    def register_factory(self, interface, factory, lifecycle=SINGLETON, override=False, pool_size=DEFAULT_POOL_SIZE, lazy=False, fork_safe=True, key=None,
+                         cache_size=DEFAULT_CACHE_SIZE, ttl=None):
+        """
+            Registers a callable that builds the service for a given interface. The factory may be
+            a coroutine function, in which case the service has to be resolved with 'aget'.
+            Parameters of the factory annotated with registered interfaces are injected.
+        """
+        if not callable(factory):
+            raise ConfigurationError(f"Dependency error: the factory {factory} for {interface} is not callable")
+        self._add_binding(interface, factory, lifecycle, override, pool_size, lazy, fork_safe, key, cache_size, ttl)
+
+    def register_instance(self, interface, instance, override=False, key=None):
+        """
+            Registers an object that is already built as the SINGLETON of a given interface.
+            It is handed out as is: it is never constructed, wired or disposed by the container.
+        """
+        if not isinstance(instance, interface):
+            raise ConfigurationError(f'Dependency error: {instance!r} is not an instance of {interface}')
+        binding = self._add_binding(interface, InstanceProvider(instance), SINGLETON, override, key=key)
+        if binding is not None:
+            self.__instances[binding] = instance
+        return binding
+
+    def _add_binding(self, interface, implementation, lifecycle, override, pool_size=DEFAULT_POOL_SIZE, lazy=False, fork_safe=True, key=None,
+                     cache_size=DEFAULT_CACHE_SIZE, ttl=None):
+        """
+            Appends a binding for the interface, honouring the 'override' flag.
+            Overriding a key replaces the binding registered under that key, at the same index.
+        """
+        if key is not None and not isinstance(key, str):
+            raise ConfigurationError(f"Dependency error: the key of {interface} must be a string, not {key!r}")
+        if lazy and lifecycle != SINGLETON:
+            raise ConfigurationError(f"Dependency error: only SINGLETON services can be lazy, {interface} is {lifecycle}")
+        if self._table is not None:
+            raise RegistrationError(f"Registration error: the container is frozen, {interface} can't be registered.")
+        source = getattr(self._registering, 'source', None)
+        staged = getattr(self._registering, 'staged', None)
+        if staged is not None:
+            # Checked against the other registrations of the interface by '_apply_staged'.
+            staged.append((interface, implementation, lifecycle, override, pool_size, lazy, fork_safe, key, cache_size, ttl, source))
+            return None
+        # In a child the first keyless registration of an interface starts a new layer that hides the
+        # parent's bindings; a keyed one starts from the parent's bindings and replaces only its key.
+        bindings = self._own_services.get(interface)
+        keys = self._own_keys.get(interface, {})
+        inherited = ()
+        if bindings is None:
+            bindings = ()
+            if key is not None and self._parent is not None:
+                bindings = inherited = self._parent._services.get(interface, ())
+                keys = self._parent._keys.get(interface, {})
+        if key is None and not override and any(binding.key is None for binding in bindings):
             raise RegistrationError(f"Registration error: Interface {interface} already has a registered implementation.")
-        if interface.__name__ not in self._services:
-            self._services[interface.__name__] = []
-        self._services[interface.__name__].append((implementation, lifecycle))
+        if key is not None and key in keys and not override and keys[key] not in inherited:
+            raise RegistrationError(f"Registration error: Interface {interface} already has an implementation with key {key!r}.")
+        pool = InstancePool(pool_size) if lifecycle == POOLED else None
+        cache = MemoCache(cache_size, ttl) if lifecycle == MEMOIZED else None
+        index = keys[key].index if key in keys else len(bindings)
+        binding = Binding(interface, implementation, lifecycle, index, pool, lazy, fork_safe, key, cache)
+        self._own_services[interface] = bindings[:index] + (binding,) + bindings[index + 1:]
+        self._own_keys[interface] = dict(keys, **{key: binding}) if key is not None else keys
+        if source is not None:
+            self._sources[binding] = source
+        self._registry_changed()
+        return binding
+
+    def reload(self, directory, module_name="module.py"):
+        """
+            Re-executes the module.py files under 'directory' that changed since they were loaded and
+            applies the difference of their registrations. Unchanged registrations keep their instances;
+            only the singletons whose dependency subgraph reaches a changed interface are built again.
+            Returns the diff, see 'loader.reload_modules'.
+        """
+        from . import loader
+        if self is not loader.container:
+            raise ConfigurationError("Dependency error: module.py files register in the global container, reload it instead")
+        if self._table is not None:
+            raise RegistrationError("Registration error: the container is frozen, it can't be reloaded.")
+        return loader.reload_modules(directory, module_name)
+
+    def watch(self, directory, interval=1.0, module_name="module.py"):
+        """Starts a daemon thread that calls 'reload' every 'interval' seconds. Returns it; call stop() to end it."""
+        from . import loader
+        if self is not loader.container:
+            raise ConfigurationError("Dependency error: module.py files register in the global container, watch it instead")
+        return loader.ModuleWatcher(directory, interval, module_name).start_watching()
+
+    def _begin_staging(self):
+        """Makes the registrations that follow, on this thread, be staged for '_apply_staged' instead of applied."""
+        self._registering.staged = []
+
+    def _abort_staging(self):
+        self._registering.staged = None
+
+    def _apply_staged(self, sources, order=()):
+        """
+            Replaces the bindings registered from the 'sources' files with the staged registrations.
+            The registrations of every touched interface are replayed in load order ('order' lists the
+            module files as they are loaded), with the checks of 'register', so indices stay what a fresh
+            load would give. A staged registration identical to a previous one keeps the previous Binding,
+            and with it the cached instances. Instances of the services that depend, directly or not, on a
+            changed interface are dropped so they are built again. Nothing changes if a check fails.
+            Returns (added, removed, rebuilt) bindings.
+        """
+        staged, self._registering.staged = self._registering.staged or [], None
+        if self._table is not None:
+            raise RegistrationError("Registration error: the container is frozen, it can't be reloaded.")
+        rank = {path: position for position, path in enumerate(order)}
+
+        def signature(implementation, lifecycle, pool_size, lazy, fork_safe, key, cache_size, ttl):
+            return (implementation, lifecycle, pool_size if lifecycle == POOLED else None, lazy, fork_safe, key,
+                    (cache_size, ttl) if lifecycle == MEMOIZED else None)
+
+        def source_of(item):
+            return self._sources.get(item) if isinstance(item, Binding) else item[-1]
+
+        groups = {}
+        for entry in staged:
+            groups.setdefault(entry[0], {}).setdefault(entry[-1], []).append(entry)
+        touched = set(groups) | {interface for interface, bindings in self._own_services.items()
+                                 if any(self._sources.get(binding) in sources for binding in bindings)}
+
+        updates = {}
+        added = []
+        for interface in touched:
+            current = self._own_services.get(interface, ())
+            entries = groups.get(interface, {})
+            sequence = []
+            previous = {}
+            for binding in current:
+                source = self._sources.get(binding)
+                if source not in sources:
+                    sequence.append(binding)
+                    continue
+                key = signature(binding.implementation, binding.lifecycle, binding.pool.size if binding.pool else None,
+                                binding.lazy, binding.fork_safe, binding.key,
+                                binding.cache.size if binding.cache else None, binding.cache.ttl if binding.cache else None)
+                previous.setdefault(key, []).append(binding)
+                if source in entries:
+                    # The registrations of a reloaded file take the place its previous ones had.
+                    sequence.extend(entries.pop(source))
+            for source, items in entries.items():
+                # A file that didn't register this interface before goes before the first later file.
+                position = next((position for position, item in enumerate(sequence)
+                                 if rank.get(source_of(item), -1) > rank.get(source, len(rank))), len(sequence))
+                sequence[position:position] = items
+
+            bindings = []
+            keys = {}
+            for item in sequence:
+                if isinstance(item, Binding):
+                    binding, override = item, True
+                else:
+                    _, implementation, lifecycle, override, pool_size, lazy, fork_safe, key, cache_size, ttl, source = item
+                    reused = previous.get(signature(implementation, lifecycle, pool_size, lazy, fork_safe, key, cache_size, ttl))
+                    if reused:
+                        binding = reused.pop(0)
+                    else:
+                        binding = Binding(interface, implementation, lifecycle, 0,
+                                          InstancePool(pool_size) if lifecycle == POOLED else None, lazy, fork_safe, key,
+                                          MemoCache(cache_size, ttl) if lifecycle == MEMOIZED else None)
+                        added.append((binding, source))
+                key = binding.key
+                if key is None and not override and any(existing.key is None for existing in bindings):
+                    raise RegistrationError(f"Registration error: Interface {interface} already has a registered implementation "
+                                            f"(reloading {source_of(item)}).")
+                if key is not None and key in keys:
+                    if not override:
+                        raise RegistrationError(f"Registration error: Interface {interface} already has an implementation "
+                                                f"with key {key!r} (reloading {source_of(item)}).")
+                    bindings[bindings.index(keys[key])] = binding
+                else:
+                    bindings.append(binding)
+                if key is not None:
+                    keys[key] = binding
+            updates[interface] = bindings
+
+        # Every check passed: apply.
+        kept = {binding for bindings in updates.values() for binding in bindings}
+        removed = [binding for interface in touched for binding in self._own_services.get(interface, ()) if binding not in kept]
+        for binding in removed:
+            self._sources.pop(binding, None)
+        added = [(binding, source) for binding, source in added if binding in kept]
+        for binding, source in added:
+            self._sources[binding] = source
+        added = [binding for binding, _ in added]
+        changed = set()
+        for interface, bindings in updates.items():
+            if tuple(bindings) == self._own_services.get(interface, ()):
+                continue
+            changed.add(interface)
+            if bindings:
+                for index, binding in enumerate(bindings):
+                    binding.index = index
+                self._own_services[interface] = tuple(bindings)
+                self._own_keys[interface] = {binding.key: binding for binding in bindings if binding.key is not None}
+            else:
+                self._own_services.pop(interface, None)
+                self._own_keys.pop(interface, None)
+
+        dependents = {}
+        for interface, bindings in self._services.items():
+            for binding in bindings:
+                # Unregistered interfaces count too: a dependency on a removed interface must be rebuilt.
+                for _, _, dependency, _ in self._dependencies(binding.implementation):
+                    if dependency is not None:
+                        dependents.setdefault(dependency, set()).add(interface)
+        affected = set(changed)
+        pending = list(changed)
+        while pending:
+            for interface in dependents.get(pending.pop(), ()):
+                if interface not in affected:
+                    affected.add(interface)
+                    pending.append(interface)
+
+        rebuilt = []
+        for binding in removed:
+            self.__instances.pop(binding, None)
+        for interface in affected:
+            for binding in self._services.get(interface, ()):
+                if self.__instances.pop(binding, _MISSING) is not _MISSING:
+                    rebuilt.append(binding)
+                if binding.cache is not None:
+                    binding.cache.clear()
+
+        if changed:
+            self._registry_changed()
+        return added, removed, rebuilt
+
+    def _registry_changed(self):
+        """
+            Drops the bound resolvers and factories and bumps the version so injection plans are recompiled.
+            Child containers are refreshed too.
+        """
+        parent = self._parent
+        if parent is not None:
+            # Copy on write: a child without registrations of its own reads the parent's registry.
+            if self._own_services:
+                self._services = {**parent._services, **self._own_services}
+                self._keys = {**parent._keys, **self._own_keys}
+            else:
+                self._services, self._keys = parent._services, parent._keys
+            self._override_dependents = {}
+            self._drop_stale_shadows()
+        self._resolvers = {}
+        self._lazy_resolvers = {}
+        self._factories = {}
+        self._async_dependencies = {}
+        self._bundles = {}
+        self._groups = {}
+        self._version += 1
+        if self._table is not None:
+            # Only a child can change once frozen: the table follows the parent's registrations.
+            self._table = None
+            self.freeze()
+        for child in list(self._children):
+            child._registry_changed()
         
     
     
+    def _drop_stale_shadows(self):
+        """
+            Keeps the private copies, and so the instances the child built, of the services whose
+            dependencies still resolve to the same bindings; the others are built again on next use.
+        """
+        for original, shadow in list(self._shadows.items()):
+            try:
+                stale = original not in self._services.get(original.interface, ()) \
+                    or not self._depends_on_overrides(original.implementation, ()) \
+                    or self._resolved_dependencies(original.implementation) != self._shadow_bindings[shadow]
+            except ConfigurationError:
+                stale = True
+            if stale:
+                del self._shadows[original]
+                del self._shadow_bindings[shadow]
+                self.__instances.pop(shadow, None)
+
+    def _resolved_dependencies(self, implementation):
+        """Returns the bindings the constructor dependencies of an implementation resolve to, transitively."""
+        found = set()
+        pending = [implementation]
+        while pending:
+            for position, name, interface, index in self._registered_dependencies(pending.pop()):
+                binding = self._binding(interface, index)
+                if binding not in found:
+                    found.add(binding)
+                    pending.append(binding.implementation)
+        return frozenset(found)
+
+    def freeze(self):
+        """
+            Compiles the registry into an immutable table with one bound resolver per binding, and
+            rejects any later registration. Circular dependencies are reported here instead of on
+            first use, and 'get' resolves with a single table lookup and no lifecycle dispatch, by
+            index or by key. A frozen child container is compiled again when its parent registers.
+        """
+        if self._table is None:
+            self._table = MappingProxyType({
+                interface: tuple(self._bind(binding, ()) for binding in bindings)
+                for interface, bindings in self._services.items()
+            })
+            self._keyed_table = {interface: {key: self._bind(binding, ()) for key, binding in keys.items()}
+                                 for interface, keys in self._keys.items() if keys}
+        return self._table
+
+    @property
+    def frozen(self):
+        """True once 'freeze' has been called."""
+        return self._table is not None
+
+    def enable_instrumentation(self, hooks=()):
+        """
+            Starts collecting per-binding counters, construction-time histograms and per-scope
+            allocation counts. 'hooks' are InstrumentationHook exporters. Returns the Instrumentation.
+        """
+        from .instrumentation import Instrumentation
+        self._instrumentation = Instrumentation(hooks, scope_manager)
+        self._rebind()
+        return self._instrumentation
+
+    def disable_instrumentation(self):
+        """Stops collecting; resolvers are bound again without any wrapper. Returns the last Instrumentation."""
+        instrumentation, self._instrumentation = self._instrumentation, None
+        self._rebind()
+        return instrumentation
+
+    @property
+    def instrumentation(self):
+        """The active Instrumentation, or None when it is disabled."""
+        return self._instrumentation
+
+    def _rebind(self):
+        """Drops every bound resolver, rebuilding the frozen table if there is one."""
+        self._registry_changed()
+
+    def export_wiring(self, path):
+        """
+            Writes the registrations as a generated Python module. 'load_wiring' (or
+            initializate(..., wiring=path)) recreates them without running module.py files or scans.
+        """
+        from .compiler import write_wiring
+        return write_wiring(self, path)
+
+    def dependency_graph(self):
+        """
+            Returns a DependencyGraph of the registrations, with the construction times measured so far
+            when the instrumentation is enabled, and the critical path of eager initialisation.
+        """
+        from .graph import DependencyGraph
+        return DependencyGraph(self)
+
+    def export_graph(self, path, format=None):
+        """Writes the dependency graph as JSON, or as Graphviz DOT for a .dot/.gv path or format="dot"."""
+        return self.dependency_graph().write(path, format)
+
+    def warmup(self, *interfaces):
+        """
+            Builds singletons ahead of time, typically in the master process of a pre-fork server,
+            so that workers inherit them copy-on-write and start without construction work.
+            Without arguments every eager, fork-safe singleton is built; async factories are left to
+            'aget'. Returns the instances.
+        """
+        if not interfaces:
+            from .initializer import eager_singletons
+            return [self.get(binding.interface, binding.index) for binding in eager_singletons(self) if binding.fork_safe]
+        return [self.get(interface) for interface in interfaces]
+
+    def initialize_all(self, parallel=True, workers=None):
+        """
+            Builds every eager singleton at boot, in dependency order. With 'parallel' independent
+            singletons are built concurrently on a thread pool of 'workers' threads, so the boot takes
+            about as long as the slowest chain instead of the sum. Every failure is reported together
+            in an InitializationError. Async factories are left to 'ainitialize_all'.
+        """
+        from .initializer import initialize
+        return initialize(self, parallel, workers)
+
+    async def ainitialize_all(self):
+        """Builds every eager singleton, async factories included, as concurrent 'aget' tasks."""
+        from .initializer import ainitialize
+        return await ainitialize(self)
+
+    def reset_after_fork(self):
+        """
+            Resets the state a child process must not inherit. It runs automatically after os.fork()
+            for every live container: locks and in-flight async constructions are dropped, as are
+            the singleton and pooled instances registered with 'fork_safe=False', and the forking
+            thread leaves its scope. Dropped instances are not disposed, since their resources
+            still belong to the parent process.
+        """
+        self.__locks = {}
+        self.__locks_guard = threading.Lock()
+        self.__pending = {}
+        if self._instrumentation is not None:
+            self._instrumentation._lock = threading.Lock()
+        dropped = False
+        for bindings in self._services.values():
+            for binding in bindings:
+                if binding.pool is not None:
+                    binding.pool._lock = threading.Lock()
+                    if not binding.fork_safe:
+                        binding.pool._idle.clear()
+                if binding.cache is not None:
+                    binding.cache._lock = threading.Lock()
+                    if not binding.fork_safe:
+                        binding.cache.clear()
+                if not binding.fork_safe and self.__instances.pop(binding, _MISSING) is not _MISSING:
+                    dropped = True
+        if dropped:
+            # Lazy resolvers may hold a proxy that already points to a dropped instance.
+            self._rebind()
+
+    def scope(self, nested=True):
+        """
+            Returns a new Scope to use as a context manager. A 'nested' scope is a child of the
+            current scope, when there is one; otherwise the scope is a root scope.
+        """
+        return Scope(self, scope_manager.get_current_scope() if nested else None)
+
     def start_scope(self):
-        """Starts a new scope."""
-        scope_id = id(threading.current_thread())
-        self.__scoped_instances[scope_id] = {}
-        scope_manager.set_current_scope(scope_id)
+        """
+            Starts a new root scope for the current thread or asyncio task and returns it.
+            A scope that was current and never ended is left to the garbage collector.
+        """
+        scope = Scope(self)
+        scope_manager.set_current_scope(scope)
+        return scope
+
+    def run_in_scope(self, fn):
+        """
+            Returns a callable that runs 'fn' in the scope that is current now, from any thread.
+            Submitted to a thread pool, it lets the workers share the scoped instances of the
+            request that fanned the work out. Without a current scope 'fn' is returned unchanged.
+        """
+        scope = scope_manager.get_current_scope()
+        if scope is None:
+            return fn
+
+        @functools.wraps(fn)
+        def run_in_scope(*args, **kwargs):
+            return scope.run(fn, *args, **kwargs)
+
+        return run_in_scope
+
+    def _detach_scope(self):
+        """Makes the parent of the current scope current again and returns the detached scope."""
+        scope = scope_manager.get_current_scope()
+        if scope is not None:
+            scope_manager.set_current_scope(scope.parent)
+        return scope
+
+    def _close_scope(self, scope):
+        """Marks a scope as closed and returns its instances, most recently created first."""
+        if scope is None or scope.closed:
+            return ()
+        scope.closed = True
+        if self._instrumentation is not None:
+            self._instrumentation.scope_ended(scope.id)
+        instances, scope.instances = scope.instances, {}
+        return reversed(list(instances.items()))
 
     def end_scope(self):
-        """Ends the current scope."""
-        scope_id = scope_manager.get_current_scope()
-        if scope_id in self.__scoped_instances:
-            del self.__scoped_instances[scope_id]
-        scope_manager.set_current_scope(None)
+        """
+            Ends the current scope. Its instances are disposed in reverse creation order through
+            close() or __exit__, and POOLED instances are reset and returned to their pool.
+        """
+        self._dispose_scope(self._detach_scope())
 
+    async def aend_scope(self):
+        """Asynchronous counterpart of 'end_scope' that also awaits aclose() and __aexit__."""
+        await self._adispose_scope(self._detach_scope())
 
+    def scope_diagnostics(self):
+        """
+            Reports the scopes of the process that are still open, oldest first, with their age in
+            seconds, their instance count and a shallow estimate of the memory they retain, and the
+            scopes that were garbage collected without being closed.
+        """
+        now = time.monotonic()
+        open_scopes = sorted((scope for scope in list(_live_scopes) if not scope.closed), key=lambda scope: scope.created)
+        return {
+            "open": [{
+                "id": scope.id,
+                "parent": scope.parent.id if scope.parent is not None else None,
+                "age": now - scope.created,
+                "instances": len(scope.instances),
+                "retained_bytes": scope.retained_bytes(),
+            } for scope in open_scopes],
+            "leaked": {"count": _scope_leaks.count, "recent": list(_scope_leaks.recent)},
+        }
 
-    def get(self, interface, index=0, *args, **kwargs):
+    def _dispose_scope(self, scope):
+        """Disposes the instances of a scope, returning POOLED instances to their pool."""
+        errors = []
+        for binding, instance in self._close_scope(scope):
+            try:
+                if binding.pool is None or not binding.pool.release(instance):
+                    _dispose(instance)
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise errors[0]
+
+    async def _adispose_scope(self, scope):
+        """Asynchronous counterpart of '_dispose_scope'."""
+        errors = []
+        for binding, instance in self._close_scope(scope):
+            try:
+                if binding.pool is None or not binding.pool.release(instance):
+                    await _adispose(instance)
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise errors[0]
+
+
+
+    def _binding(self, interface, index):
         """
-        Retrieves an instance of the service registered for the provided interface.
-        The lifecycle determines how the instance is created and managed.
+            Returns the Binding registered for the interface at the given index, or under the given key
+            when 'index' is a string. Type hints such as Optional[X] are reduced to X when they are not
+            registered as such.
         """
-        if interface.__name__ not in self._services:
-            raise ConfigurationError(f"Dependency error: No service registered for interface {interface}")
-        
+        bindings = self._services.get(interface)
+        if bindings is None:
+            target = injection_target(interface)
+            bindings = self._services.get(target) if target is not None else None
+            if bindings is None:
+                raise ConfigurationError(f"Dependency error: No service registered for interface {interface}")
+            interface = target
+
+        if isinstance(index, str):
+            keys = self._keys.get(interface, {})
+            try:
+                return keys[index]
+            except KeyError:
+                raise ConfigurationError(f"Dependency error: No implementation of {interface_name(interface)} registered with key {index!r}. "
+                                         f"Registered keys: {', '.join(map(repr, keys)) or 'none'}") from None
         try:
-            implementation, lifecycle = self._services[interface.__name__][index]
-        except:
-            raise ConfigurationError(f"Check the module.py and check if you have more than 1 implementation of {interface.__name__} and check at the injection site that you are not injecting more than it should be  ")
+            return bindings[index]
+        except (IndexError, TypeError):
+            raise ConfigurationError(f"Check the module.py and check if you have more than 1 implementation of {interface_name(interface)} and check at the injection site that you are not injecting more than it should be  ")
+
+    def _dependencies(self, implementation):
+        """Returns the cached (position, name, interface, key) constructor parameters of an implementation."""
+        dependencies = self._dependency_graph.get(implementation)
+        if dependencies is None:
+            dependencies = self._dependency_graph[implementation] = tuple(
+                (position, name, injection_target(annotation), injection_key(annotation))
+                for position, name, annotation in injectable_parameters(implementation)
+            )
+        return dependencies
+
+    def _registered_dependencies(self, implementation):
+        """
+            Returns (position, name, interface, index) for the constructor parameters of an implementation
+            whose interface is registered; 'index' is the key of an Annotated hint, or 0.
+        """
+        return [(position, name, interface, 0 if key is None else key)
+                for position, name, interface, key in self._dependencies(implementation)
+                if interface is not None and interface in self._services]
+
+    def _factory(self, implementation, stack=()):
+        """
+            Returns a callable that builds 'implementation', resolving the constructor parameters
+            annotated with registered interfaces that the caller did not pass.
+        """
+        factory = self._factories.get(implementation)
+        if factory is not None:
+            return factory
+
+        resolvers = tuple(
+            (position, name, self._injection_resolver(self._binding(interface, index), stack))
+            for position, name, interface, index in self._registered_dependencies(implementation)
+        )
+        import inspect
+        if inspect.iscoroutinefunction(implementation):
+            def factory(*args, **kwargs):
+                raise ConfigurationError(f"Dependency error: {implementation} is an async factory, resolve it with 'aget'")
+        elif not resolvers:
+            factory = implementation
+        else:
+            def factory(*args, **kwargs):
+                nargs = len(args)
+                for position, name, resolve in resolvers:
+                    if position >= nargs and name not in kwargs:
+                        kwargs[name] = resolve()
+                return implementation(*args, **kwargs)
+
+        self._factories[implementation] = factory
+        return factory
 
+    def _lock_for(self, key):
+        """Returns the lock that guards the creation of the instance stored under 'key'."""
+        locks = self.__locks
+        lock = locks.get(key)
+        if lock is None:
+            with self.__locks_guard:
+                lock = locks.setdefault(key, threading.RLock())
+        return lock
+
+    def _create(self, binding, args, kwargs):
+        """
+            Creates or reuses an instance according to its lifecycle.
+            Singleton instances are created under a per-binding lock and scoped instances under the
+            lock of their scope, with a double check, so they are never built twice; reading an
+            existing instance takes no lock.
+        """
+        implementation = self._factory(binding.implementation)
+        if self._instrumentation is not None:
+            implementation = self._instrumentation.constructor(binding, implementation)
+        lifecycle = binding.lifecycle
         if lifecycle == SINGLETON:
-            if (interface.__name__, index) not in self.__instances:
-                self.__instances[(interface.__name__, index)] = implementation(*args, **kwargs)
-            return self.__instances[(interface.__name__, index)]
+            instance = self.__instances.get(binding, _MISSING)
+            if instance is _MISSING:
+                with self._lock_for(binding):
+                    instance = self.__instances.get(binding, _MISSING)
+                    if instance is _MISSING:
+                        instance = self.__instances[binding] = implementation(*args, **kwargs)
+            return instance
         
         elif lifecycle == TRANSIENT:
             return implementation(*args, **kwargs)
         
-        elif lifecycle == SCOPED:
-            scope_id = scope_manager.get_current_scope()
-            if scope_id is None:
+        elif lifecycle == MEMOIZED:
+            key = binding.cache.key(args, kwargs)
+            instance = binding.cache.get(key)
+            if instance is _MISSING:
+                instance = self._memoize(binding, key, implementation, args, kwargs)
+            return instance
+
+        elif lifecycle == SCOPED or lifecycle == POOLED:
+            scope = scope_manager.get_current_scope()
+            if scope is None:
                 raise RuntimeError("No active scope. Ensure you call start_scope() before requesting a SCOPED service.")
-            
-            if scope_id not in self.__scoped_instances:
-                self.__scoped_instances[scope_id] = {}
-            if interface.__name__ not in self.__scoped_instances[scope_id]:
-                self.__scoped_instances[scope_id][interface.__name__] = implementation(*args, **kwargs)
-            return self.__scoped_instances[scope_id][interface.__name__]
+            instance = scope.instances.get(binding, _MISSING)
+            if instance is _MISSING:
+                instance = self._create_scoped(binding, scope, implementation, args, kwargs)
+            return instance
     
         
         else:
             raise RuntimeError("No active scope. Ensure you call start_scope() before requesting a SCOPED service.")
+
+    def _memoize(self, binding, key, implementation, args, kwargs):
+        """Builds and caches the instance of a MEMOIZED service for 'key' unless another thread just did."""
+        with self._lock_for(binding):
+            instance = binding.cache.get(key)
+            if instance is _MISSING:
+                instance = binding.cache.put(key, implementation(*args, **kwargs))
+        return instance
+
+    def _create_scoped(self, binding, scope, implementation, args, kwargs):
+        """Builds, or takes from its pool, the instance of a SCOPED or POOLED service in 'scope'."""
+        with scope._lock:
+            instance = scope.find(binding)
+            if instance is _MISSING:
+                if scope.closed:
+                    raise RuntimeError(f"The scope {scope.id} has ended. Start a new scope before requesting a SCOPED service.")
+                if binding.lifecycle == POOLED:
+                    instance = binding.pool.acquire()
+                if instance is _MISSING:
+                    instance = implementation(*args, **kwargs)
+                scope.instances[binding] = instance
+        return instance
+
+    def resolver(self, interface, index=0, lazy=None):
+        """
+            Returns a callable without arguments that resolves the service.
+            The registry lookup and the lifecycle dispatch are done once, when the resolver is bound.
+            With 'lazy' (by default, the 'lazy' flag of the registration) a singleton that is not built
+            yet resolves to a LazyProxy; once it is built, the real instance is returned.
+        """
+        binding = self._binding(interface, index)
+        if lazy is None:
+            return self._injection_resolver(binding, ())
+        return self._lazy(binding, ()) if lazy else self._bind(binding, ())
+
+    def _injection_resolver(self, binding, stack):
+        """Returns the resolver used to inject a binding, which is lazy when the binding asks for it."""
+        return self._lazy(binding, stack) if binding.lazy else self._bind(binding, stack)
+
+    def _lazy(self, binding, stack):
+        """Binds a resolver that hands out a LazyProxy until the singleton has been built."""
+        resolve = self._lazy_resolvers.get(binding)
+        if resolve is not None:
+            return resolve
+
+        if self._parent is not None:
+            owner, target = self._owner(binding)
+            if owner is not self:
+                resolve = self._lazy_resolvers[binding] = owner._lazy(target, ())
+                return resolve
+            binding = target
+
+        eager = self._bind(binding, stack)
+        # The class the proxy reports until it is resolved: the implementation, or the interface of a factory.
+        cls = next((item for item in (binding.implementation, binding.interface) if isinstance(item, type)), None)
+        if binding.lifecycle != SINGLETON:
+            def resolve():
+                return LazyProxy(eager, cls)
+        else:
+            instances = self.__instances
+            proxy = LazyProxy(eager, cls)
+
+            def resolve():
+                instance = instances.get(binding, _MISSING)
+                if instance is _MISSING:
+                    return proxy
+                return instance
+
+        self._lazy_resolvers[binding] = resolve
+        return resolve
+
+    def _owner(self, binding):
+        """
+            Returns the (container, binding) that builds a binding seen by a child container: the child
+            for its own bindings, an ancestor for inherited ones, or the child with a private copy of
+            the binding when an inherited service depends on something the child overrides.
+        """
+        if self._parent is None or binding in self._shadow_bindings \
+                or binding in self._own_services.get(binding.interface, ()) \
+                and binding not in self._parent._services.get(binding.interface, ()):
+            return self, binding
+        if self._depends_on_overrides(binding.implementation, ()):
+            shadow = self._shadows.get(binding)
+            if shadow is None:
+                shadow = Binding(binding.interface, binding.implementation, binding.lifecycle, binding.index,
+                                 InstancePool(binding.pool.size) if binding.pool is not None else None,
+                                 binding.lazy, binding.fork_safe, binding.key,
+                                 MemoCache(binding.cache.size, binding.cache.ttl) if binding.cache is not None else None)
+                self._shadows[binding] = shadow
+                self._shadow_bindings[shadow] = self._resolved_dependencies(binding.implementation)
+            return self, shadow
+        return self._parent._owner(binding)
+
+    def _depends_on_overrides(self, implementation, visiting):
+        """True if the constructor dependencies of an implementation reach an interface registered in this child."""
+        result = self._override_dependents.get(implementation)
+        if result is not None:
+            return result
+        result = False
+        for position, name, interface, index in self._registered_dependencies(implementation):
+            if interface in self._own_services:
+                result = True
+                break
+            dependency = self._binding(interface, index).implementation
+            if dependency not in visiting and self._depends_on_overrides(dependency, visiting + (implementation,)):
+                result = True
+                break
+        self._override_dependents[implementation] = result
+        return result
+
+    def _bind(self, binding, stack):
+        """Binds the resolver of a service, detecting circular constructor dependencies on the way."""
+        resolve = self._resolvers.get(binding)
+        if resolve is not None:
+            return resolve
+
+        if self._parent is not None:
+            owner, target = self._owner(binding)
+            if owner is not self or target is not binding:
+                resolve = self._resolvers[binding] = owner._bind(target, stack if owner is self else ())
+                return resolve
+
+        if binding in stack:
+            chain = [item.name for item in stack[stack.index(binding):]] + [binding.name]
+            raise CircularDependencyError(f"Dependency error: Circular dependency detected: {' -> '.join(chain)}")
+
+        factory = self._factory(binding.implementation, stack + (binding,))
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            factory = instrumentation.constructor(binding, factory)
+        if binding.lifecycle == SINGLETON:
+            instances = self.__instances
+
+            def resolve():
+                instance = instances.get(binding, _MISSING)
+                if instance is _MISSING:
+                    instance = self._create(binding, (), {})
+                return instance
+        elif binding.lifecycle == TRANSIENT:
+            resolve = factory
+        elif binding.lifecycle == SCOPED or binding.lifecycle == POOLED:
+            current_scope = scope_manager._current_scope.get
+            create_scoped = self._create_scoped
+
+            def resolve():
+                scope = current_scope()
+                if scope is None:
+                    raise RuntimeError("No active scope. Ensure you call start_scope() before requesting a SCOPED service.")
+                instance = scope.instances.get(binding, _MISSING)
+                if instance is _MISSING:
+                    instance = create_scoped(binding, scope, factory, (), {})
+                return instance
+        elif binding.lifecycle == MEMOIZED:
+            cache = binding.cache
+            key = cache.key((), {})
+
+            def resolve():
+                instance = cache.get(key)
+                if instance is _MISSING:
+                    instance = self._memoize(binding, key, factory, (), {})
+                return instance
+        else:
+            def resolve():
+                return self._create(binding, (), {})
+
+        if instrumentation is not None:
+            resolve = instrumentation.resolver(binding, resolve)
+        self._resolvers[binding] = resolve
+        return resolve
+
+    def bundle(self, interfaces, lazy=None):
+        """
+            Returns a callable without arguments that resolves several services in one pass and
+            returns their instances as a list, in order. Items are interfaces or (interface, index)
+            pairs, where the index may be a key. The bindings are looked up once, when the bundle is built, and each call looks up
+            the current scope once for all the scoped services of the bundle.
+        """
+        return self._resolve_steps(self._bundle_steps(interfaces, lazy))
+
+    def _bundle_steps(self, interfaces, lazy):
+        """
+            Returns the (binding, resolver) steps of a bundle; the binding is set for the scoped
+            services whose existing instances are read straight from the scope, None otherwise.
+        """
+        steps = []
+        for item in interfaces:
+            if isinstance(item, tuple) and len(item) == 2 and isinstance(item[1], (int, str)):
+                interface, index = item
+            else:
+                interface, index = item, 0
+            binding = self._binding(interface, index)
+            resolve = self.resolver(interface, index, lazy)
+            # Scoped instances that already exist are read straight from the scope; the resolver
+            # is only called to build them (or when it is wrapped by a lazy proxy or instrumentation).
+            direct = (binding.lifecycle == SCOPED or binding.lifecycle == POOLED) and resolve is self._resolvers.get(binding) \
+                and self._instrumentation is None
+            if direct and self._parent is not None:
+                # A child stores the instances of a service it rebuilds under its private copy of the binding.
+                binding = self._owner(binding)[1]
+            steps.append((binding if direct else None, resolve))
+        return tuple(steps)
+
+    def _resolve_steps(self, steps):
+        """Returns the callable of a bundle that resolves 'steps' and returns the instances as a list."""
+        if not any(binding is not None for binding, _ in steps):
+            resolvers = [resolve for _, resolve in steps]
+
+            def resolve_all():
+                return [resolve() for resolve in resolvers]
+        else:
+            def resolve_all():
+                scope = scope_manager.get_current_scope()
+                instances = scope.instances if scope is not None else _NO_INSTANCES
+                values = []
+                for binding, resolve in steps:
+                    if binding is None:
+                        values.append(resolve())
+                    else:
+                        instance = instances.get(binding, _MISSING)
+                        values.append(resolve() if instance is _MISSING else instance)
+                return values
+
+        return resolve_all
+
+    def get_many(self, interfaces):
+        """
+            Resolves several services at once and returns their instances as a list, in order.
+            Items are interfaces or (interface, index) pairs; the bundle built for a given
+            sequence is cached until the registry changes.
+        """
+        key = tuple(interfaces)
+        resolve_all = self._bundles.get(key)
+        if resolve_all is None:
+            resolve_all = self._bundles[key] = self.bundle(key)
+        return resolve_all()
+
+    def get_all(self, interface):
+        """
+            Returns a tuple with an instance of every implementation registered for the interface,
+            in registration order, for plugin fan-out. When they are all eager singletons the tuple
+            itself is cached until the registry changes.
+        """
+        resolve_all = self._groups.get(interface)
+        if resolve_all is None:
+            bindings = self._services[self._binding(interface, 0).interface]
+            bundle = self.bundle([(binding.interface, binding.index) for binding in bindings])
+            if self._instrumentation is None and all(binding.lifecycle == SINGLETON and not binding.lazy for binding in bindings):
+                resolved = []
+
+                def resolve_all():
+                    if not resolved:
+                        resolved.append(tuple(bundle()))
+                    return resolved[0]
+            else:
+                def resolve_all():
+                    return tuple(bundle())
+            self._groups[interface] = resolve_all
+        return resolve_all()
+
+    def get(self, interface, index=0, *args, **kwargs):
+        """
+        Retrieves an instance of the service registered for the provided interface.
+        The lifecycle determines how the instance is created and managed. 'index' selects one of
+        several implementations by registration order, or by key when it is a string.
+        """
+        table = self._table
+        if table is not None and not args and not kwargs:
+            try:
+                resolve = table[interface][index]
+            except TypeError:
+                resolve = self._keyed_table.get(interface, {}).get(index)
+                if resolve is not None:
+                    return resolve()
+            except (KeyError, IndexError):
+                pass
+            else:
+                return resolve()
+        try:
+            binding = self._services[interface][index]
+        except (KeyError, IndexError, TypeError):
+            binding = self._binding(interface, index)
+        if args or kwargs:
+            owner, binding = self._owner(binding)
+            return owner._create(binding, args, kwargs)
+        resolve = self._resolvers.get(binding)
+        if resolve is None:
+            resolve = self._bind(binding, ())
+        return resolve()
+
+    async def _acreate(self, implementation, args, kwargs):
+        """Builds an implementation, awaiting its dependencies concurrently and the factory if it is async."""
+        dependencies = self._async_dependencies.get(implementation)
+        if dependencies is None:
+            self._factory(implementation)
+            dependencies = self._async_dependencies[implementation] = tuple(self._registered_dependencies(implementation))
+
+        nargs = len(args)
+        missing = [(name, interface, index) for position, name, interface, index in dependencies
+                   if position >= nargs and name not in kwargs]
+        if missing:
+            import asyncio
+            values = await asyncio.gather(*(self.aget(interface, index) for _, interface, index in missing))
+            kwargs = dict(kwargs, **{name: value for (name, _, _), value in zip(missing, values)})
+
+        instance = implementation(*args, **kwargs)
+        import inspect
+        if inspect.isawaitable(instance):
+            instance = await instance
+        return instance
+
+    async def aget(self, interface, index=0, *args, **kwargs):
+        """
+        Asynchronous counterpart of 'get'. Async factories are awaited, independent constructor
+        dependencies are resolved concurrently, and concurrent requests for a singleton or scoped
+        service that is still being built await the same construction.
+        """
+        owner, binding = self._owner(self._binding(interface, index))
+        if owner is not self:
+            return await owner._aget(binding, args, kwargs)
+        return await self._aget(binding, args, kwargs)
+
+    async def _aget(self, binding, args, kwargs):
+        """Resolves a binding owned by this container for 'aget'."""
+        lifecycle = binding.lifecycle
+
+        if lifecycle == TRANSIENT:
+            return await self._acreate(binding.implementation, args, kwargs)
+        elif lifecycle == MEMOIZED:
+            key = binding.cache.key(args, kwargs)
+            instance = binding.cache.get(key)
+            if instance is _MISSING:
+                instance = binding.cache.put(key, await self._acreate(binding.implementation, args, kwargs))
+            return instance
+        elif lifecycle == SINGLETON:
+            instances, pending_key = self.__instances, binding
+        elif lifecycle == SCOPED or lifecycle == POOLED:
+            scope = scope_manager.get_current_scope()
+            if scope is None:
+                raise RuntimeError("No active scope. Ensure you call start_scope() before requesting a SCOPED service.")
+            instance = scope.find(binding)
+            if instance is not _MISSING:
+                return instance
+            if scope.closed:
+                raise RuntimeError(f"The scope {scope.id} has ended. Start a new scope before requesting a SCOPED service.")
+            instances, pending_key = scope.instances, (scope, binding)
+            if lifecycle == POOLED and binding not in instances:
+                instance = binding.pool.acquire()
+                if instance is not _MISSING:
+                    instances[binding] = instance
+        else:
+            raise RuntimeError("No active scope. Ensure you call start_scope() before requesting a SCOPED service.")
+
+        instance = instances.get(binding, _MISSING)
+        if instance is not _MISSING:
+            return instance
+
+        import asyncio
+        pending = self.__pending.get(pending_key)
+        if pending is None:
+            pending = self.__pending[pending_key] = asyncio.ensure_future(self._acreate(binding.implementation, args, kwargs))
+
+            def settle(task):
+                self.__pending.pop(pending_key, None)
+                if not task.cancelled() and task.exception() is None:
+                    instances.setdefault(binding, task.result())
+
+            pending.add_done_callback(settle)
+        await asyncio.shield(pending)
+        return instances.get(binding, pending.result())
     
 container = DependencyContainer()
@@ -9,3 +9,21 @@ class ConfigurationError(DependencyInjectionError):
 class RegistrationError(DependencyInjectionError):
     """Raised when there's an error in service registration."""
     pass
+
+
+class CircularDependencyError(ConfigurationError):
+    """Raised when the constructor dependencies of a service form a cycle."""
+    pass
+
+
+class InitializationError(DependencyInjectionError):
+    """Raised by initialize_all with every singleton that failed to build; 'errors' holds (binding, exception)."""
+
+    def __init__(self, errors, skipped=()):
+        self.errors = list(errors)
+        self.skipped = list(skipped)
+        lines = [f"Dependency error: {len(self.errors)} singleton(s) failed to initialise:"]
+        lines += [f"  {binding!r}: {type(error).__name__}: {error}" for binding, error in self.errors]
+        if self.skipped:
+            lines.append(f"  not built because a dependency failed: {', '.join(map(repr, self.skipped))}")
+        super().__init__('\n'.join(lines))
@@ -0,0 +1,214 @@
+import ast
+import importlib
+import json
+import os
+import sys
+
+INDEX_VERSION = 3
+REGISTER_METHODS = ('register', 'register_factory', 'register_instance')
+
+
+def _base_name(node):
+    """Returns the last name of a base class expression ('pkg.mod.IService' -> 'IService')."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Subscript):
+        return _base_name(node.value)
+    return None
+
+
+def scan_source(source, path='<unknown>'):
+    """
+        Parses a module once and returns (registers_services, classes), where 'classes' is a list
+        of [class name, [base names]] for the classes defined at module level. A module registers
+        services when it imports 'container' from injector_api or calls container.register(...);
+        merely using a name or attribute called 'container' doesn't count.
+    """
+    try:
+        tree = ast.parse(source, path)
+    except SyntaxError:
+        return False, []
+
+    aliases = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+
+    classes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = [aliases.get(name, name) for name in map(_base_name, node.bases) if name]
+            classes.append([node.name, bases])
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and (node.module or '').split('.')[0] == 'injector_api' \
+                and any(alias.name == 'container' for alias in node.names):
+            return True, classes
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr in REGISTER_METHODS:
+            receiver = node.func.value
+            if (isinstance(receiver, ast.Name) and receiver.id == 'container') or \
+                    (isinstance(receiver, ast.Attribute) and receiver.attr == 'container'):
+                return True, classes
+    return False, classes
+
+
+class DiscoveryIndex:
+    """
+        Static index of the classes defined in the modules of a package.
+        Modules are parsed once with 'ast', without importing them, and an inheritance index
+        (base name -> subclasses) is built across the package. Only the modules that define real
+        candidates are imported. Each file entry is keyed by its mtime and size, so a persisted
+        index only re-parses the files that changed since it was written.
+    """
+
+    def __init__(self, package, cache_path=None):
+        self.package = package
+        self.cache_path = cache_path
+        self._files = {}
+        self._names = {}
+        self._subclasses = {}
+        self._built = False
+
+    def load(self):
+        """Loads a previously persisted index. Returns True if the cache file was usable."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("package") != self.package.__name__:
+            return False
+        self._files = {path: tuple(entry) for path, entry in data.get("files", {}).items()}
+        return True
+
+    def save(self):
+        """Persists the index to 'cache_path', if one was provided."""
+        if not self.cache_path:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "package": self.package.__name__,
+            "files": {path: list(entry) for path, entry in self._files.items()},
+        }
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _iter_module_files(self):
+        """Yields (path, module name) for every non-package module under the package."""
+        for base_path in self.package.__path__:
+            for root, dirs, files in os.walk(base_path):
+                dirs[:] = sorted(d for d in dirs if os.path.exists(os.path.join(root, d, '__init__.py')))
+                relative = os.path.relpath(root, base_path)
+                prefix = self.package.__name__ if relative == os.curdir else \
+                    self.package.__name__ + '.' + relative.replace(os.sep, '.')
+                for file_name in sorted(files):
+                    if file_name.endswith('.py') and file_name != '__init__.py':
+                        yield os.path.join(root, file_name), prefix + '.' + file_name[:-3]
+
+    def _scan_file(self, path, module_name, stat):
+        """Parses a module once and records the classes it defines and whether it uses the container."""
+        with open(path, 'r') as f:
+            registers_services, classes = scan_source(f.read(), path)
+        return (stat.st_mtime, stat.st_size, module_name, registers_services, classes)
+
+    def refresh(self):
+        """
+            Brings the index up to date with the files on disk.
+            Returns the list of files that had to be parsed again.
+        """
+        seen = set()
+        rescanned = []
+        for path, module_name in self._iter_module_files():
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = self._files.get(path)
+            if entry is not None and entry[0] == stat.st_mtime and entry[1] == stat.st_size and entry[2] == module_name:
+                continue
+            self._files[path] = self._scan_file(path, module_name, stat)
+            rescanned.append(path)
+
+        removed = [path for path in self._files if path not in seen]
+        for path in removed:
+            del self._files[path]
+
+        self._names = {}
+        self._subclasses = {}
+        for path, (_, _, module_name, registers_services, classes) in self._files.items():
+            # Registration modules (module.py) would register their services again if imported.
+            if registers_services:
+                continue
+            for class_name, bases in classes:
+                self._names.setdefault(class_name, []).append(module_name)
+                for base in bases:
+                    self._subclasses.setdefault(base, []).append((module_name, class_name))
+
+        self._built = True
+        if rescanned or removed:
+            self.save()
+        return rescanned
+
+    def build(self):
+        """Builds the index once, starting from the persisted copy when available."""
+        if not self._built:
+            self.load()
+            self.refresh()
+        return self
+
+    def modules_defining(self, class_name):
+        """Returns the module names that define a class with the given name."""
+        self.build()
+        return list(self._names.get(class_name, ()))
+
+    def candidates(self, interface):
+        """
+            Returns the (module name, class name) pairs whose static inheritance chain reaches
+            the interface (or any interface of a tuple), following base names across the package.
+        """
+        self.build()
+        interfaces = interface if isinstance(interface, tuple) else (interface,)
+        pending = [item.__name__ for item in interfaces]
+        visited = set(pending)
+        found = {}
+        while pending:
+            for module_name, class_name in self._subclasses.get(pending.pop(), ()):
+                found.setdefault((module_name, class_name), None)
+                if class_name not in visited:
+                    visited.add(class_name)
+                    pending.append(class_name)
+        return list(found)
+
+    def _import_matches(self, interface, candidates):
+        """Imports the modules of the candidates and keeps the classes that really implement the interface."""
+        current_script_name = sys.argv[0].replace("/", ".").replace("\\", ".").rstrip(".py")
+        matches = []
+        for module_name, class_name in candidates:
+            if module_name in (current_script_name, self.package.__name__ + '.' + current_script_name):
+                continue
+            module = importlib.import_module(module_name)
+            candidate = getattr(module, class_name, None)
+            if isinstance(candidate, type) and issubclass(candidate, interface) \
+                    and candidate is not interface and candidate not in matches:
+                matches.append(candidate)
+        return matches
+
+    def find(self, interface, implementation_name):
+        """Returns the classes named 'implementation_name' that implement 'interface'."""
+        return self._import_matches(interface, [
+            (module_name, class_name) for module_name, class_name in self.candidates(interface)
+            if class_name == implementation_name
+        ])
+
+    def find_subclasses(self, interface):
+        """Returns every class of the package that implements 'interface'."""
+        return self._import_matches(interface, self.candidates(interface))
@@ -0,0 +1,29 @@
+from .container import container as default_container
+
+
+class ScopedExecutor:
+    """
+        Wraps a concurrent.futures executor so that every submitted function runs in the scope
+        that was current when it was submitted. Workers then share the scoped instances of the
+        request instead of seeing no scope.
+    """
+
+    def __init__(self, executor, container=None):
+        self.executor = executor
+        self.container = container if container is not None else default_container
+
+    def submit(self, fn, *args, **kwargs):
+        return self.executor.submit(self.container.run_in_scope(fn), *args, **kwargs)
+
+    def map(self, fn, *iterables, **kwargs):
+        return self.executor.map(self.container.run_in_scope(fn), *iterables, **kwargs)
+
+    def shutdown(self, wait=True, **kwargs):
+        self.executor.shutdown(wait, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown(wait=True)
+        return False
@@ -0,0 +1,177 @@
+import json
+
+from .container import SINGLETON
+from .dependencyError import ConfigurationError
+
+DOT_FORMATS = ('.dot', '.gv')
+
+
+def _qualifier(binding):
+    return f"[{repr(binding.key) if binding.key is not None else binding.index}]"
+
+
+def _interface_path(interface):
+    if isinstance(interface, tuple):
+        return '(' + ', '.join(_interface_path(item) for item in interface) + ')'
+    module = getattr(interface, '__module__', None)
+    qualname = getattr(interface, '__qualname__', None)
+    return f"{module}.{qualname}" if module and qualname else repr(interface)
+
+
+def node_id(binding):
+    """
+        Returns the id of a binding in the graph: package.module.Interface[index] or [key], so that
+        interfaces with the same name in different modules stay apart.
+    """
+    return _interface_path(binding.interface) + _qualifier(binding)
+
+
+def node_label(binding):
+    """Returns the short name of a binding shown to readers: Interface[index] or Interface['key']."""
+    return binding.name + _qualifier(binding)
+
+
+def _qualname(obj):
+    return getattr(obj, '__qualname__', None) or getattr(obj, '__name__', None) or repr(obj)
+
+
+class DependencyGraph:
+    """
+        The bindings of a container and the dependencies their constructors resolve, annotated with
+        the construction times measured by the instrumentation, when it is enabled. The critical path
+        is the chain of eager singleton constructions with the highest total self time: the lower
+        bound of the boot time however the independent constructions are scheduled.
+    """
+
+    def __init__(self, container):
+        self.bindings = [binding for bindings in container._services.values() for binding in bindings]
+        self.dependencies = {}
+        self.missing = {}
+        for binding in self.bindings:
+            edges = []
+            for position, name, interface, index in container._registered_dependencies(binding.implementation):
+                try:
+                    edges.append((name, container._binding(interface, index)))
+                except ConfigurationError:
+                    self.missing.setdefault(binding, []).append(name)
+            self.dependencies[binding] = edges
+        instrumentation = container.instrumentation
+        self.stats = dict(instrumentation.stats) if instrumentation is not None else {}
+
+    def self_time(self, binding):
+        """Mean construction time of a binding in seconds, without its dependencies; 0 if never measured."""
+        stats = self.stats.get(binding)
+        return stats.mean_self_construct_time if stats is not None else 0.0
+
+    def eager(self, binding):
+        return binding.lifecycle == SINGLETON and not binding.lazy
+
+    def critical_path(self):
+        """Returns (bindings, seconds): the slowest chain of constructions started by an eager singleton."""
+        longest = {}
+
+        def visit(binding, visiting):
+            if binding in longest:
+                return longest[binding]
+            best = (0.0, ())
+            for _, dependency in self.dependencies.get(binding, ()):
+                # Lazy singletons are not built by their dependents; a cycle can't be built at all.
+                if dependency.lazy or dependency in visiting:
+                    continue
+                candidate = visit(dependency, visiting | {binding})
+                # Without measurements every chain weighs 0 and the longest one is reported.
+                if (candidate[0], len(candidate[1])) > (best[0], len(best[1])):
+                    best = candidate
+            result = longest[binding] = (self.self_time(binding) + best[0], (binding,) + best[1])
+            return result
+
+        roots = [visit(binding, frozenset()) for binding in self.bindings if self.eager(binding)]
+        seconds, path = max(roots, key=lambda item: (item[0], len(item[1])), default=(0.0, ()))
+        return list(path), seconds
+
+    def as_dict(self):
+        """Returns the graph as plain data: nodes, edges and the critical path, times in milliseconds."""
+        path, seconds = self.critical_path()
+        nodes = []
+        for binding in self.bindings:
+            stats = self.stats.get(binding)
+            nodes.append({
+                "id": node_id(binding),
+                "label": node_label(binding),
+                "interface": binding.name,
+                "implementation": _qualname(binding.implementation),
+                "lifecycle": binding.lifecycle,
+                "index": binding.index,
+                "key": binding.key,
+                "lazy": binding.lazy,
+                "constructions": stats.constructions if stats is not None else 0,
+                "construct_ms": stats.mean_construct_time * 1e3 if stats is not None else None,
+                "self_ms": stats.mean_self_construct_time * 1e3 if stats is not None else None,
+                "missing": self.missing.get(binding, []),
+            })
+        edges = [{"from": node_id(binding), "to": node_id(dependency), "parameter": name}
+                 for binding in self.bindings for name, dependency in self.dependencies[binding]]
+        eager_ms = sum(self.self_time(binding) for binding in self._eager_closure()) * 1e3
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "critical_path": {"nodes": [node_id(binding) for binding in path], "ms": seconds * 1e3},
+            "eager_ms": eager_ms,
+        }
+
+    def _eager_closure(self):
+        """Bindings built when every eager singleton is built."""
+        seen = set()
+        pending = [binding for binding in self.bindings if self.eager(binding)]
+        while pending:
+            binding = pending.pop()
+            if binding not in seen:
+                seen.add(binding)
+                pending.extend(dependency for _, dependency in self.dependencies[binding] if not dependency.lazy)
+        return seen
+
+    def to_json(self, indent=2):
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def to_dot(self):
+        """Returns the graph in Graphviz DOT; the critical path is drawn in red."""
+        path, _ = self.critical_path()
+        on_path = set(zip(path, path[1:]))
+        lines = ["digraph injector_api {", "  rankdir=LR;", "  node [shape=box, fontname=monospace];"]
+        for binding in self.bindings:
+            label = f"{node_label(binding)}\n{_qualname(binding.implementation)}\n{binding.lifecycle}"
+            stats = self.stats.get(binding)
+            if stats is not None and stats.constructions:
+                label += f"\n{stats.mean_self_construct_time * 1e3:.3f} ms"
+            style = ", color=red, penwidth=2" if binding in path else ""
+            style += ", style=dashed" if binding.lazy else ""
+            lines.append(f"  {json.dumps(node_id(binding))} [label={json.dumps(label)}{style}];")
+        for binding in self.bindings:
+            for name, dependency in self.dependencies[binding]:
+                style = ", color=red, penwidth=2" if (binding, dependency) in on_path else ""
+                lines.append(f"  {json.dumps(node_id(binding))} -> {json.dumps(node_id(dependency))} "
+                             f"[label={json.dumps(name)}{style}];")
+        lines.append("}")
+        return '\n'.join(lines) + '\n'
+
+    def report(self):
+        """Returns a text summary of the critical path."""
+        path, seconds = self.critical_path()
+        eager_ms = sum(self.self_time(binding) for binding in self._eager_closure()) * 1e3
+        lines = [f"{len(self.bindings)} bindings, {sum(map(len, self.dependencies.values()))} dependencies",
+                 f"Eager initialisation: {eager_ms:.3f} ms sequential, critical path {seconds * 1e3:.3f} ms"]
+        for binding in path:
+            lines.append(f"  {self.self_time(binding) * 1e3:>10.3f} ms  {node_label(binding)} -> "
+                         f"{_qualname(binding.implementation)} ({binding.lifecycle})")
+        if not self.stats:
+            lines.append("No construction times: enable the instrumentation before building the services.")
+        return '\n'.join(lines)
+
+    def write(self, path, format=None):
+        """Writes the graph to 'path' as JSON, or as DOT when 'format' is "dot" or the extension is .dot/.gv."""
+        if format is None:
+            format = "dot" if path.endswith(DOT_FORMATS) else "json"
+        text = self.to_dot() if format == "dot" else self.to_json()
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
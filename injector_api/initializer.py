@@ -0,0 +1,139 @@
+import inspect
+
+from .container import SINGLETON
+from .dependencyError import ConfigurationError, InitializationError
+
+
+def eager_singletons(container):
+    """Returns the singleton bindings that are built at boot: neither lazy nor async factories."""
+    return [binding for bindings in container._services.values() for binding in bindings
+            if binding.lifecycle == SINGLETON and not binding.lazy
+            and not inspect.iscoroutinefunction(binding.implementation)]
+
+
+def singleton_dependencies(container, binding, eager):
+    """
+        Returns the bindings in 'eager' that building 'binding' needs, looking through transient,
+        memoized and scoped dependencies, which are built inline by their dependents.
+    """
+    found = set()
+    seen = {binding}
+    pending = [binding]
+    while pending:
+        current = pending.pop()
+        for _, _, interface, index in container._registered_dependencies(current.implementation):
+            try:
+                dependency = container._binding(interface, index)
+            except ConfigurationError:
+                continue  # reported when the dependent is built
+            if dependency in seen:
+                continue
+            seen.add(dependency)
+            if dependency in eager:
+                found.add(dependency)
+            elif dependency.lifecycle != SINGLETON:
+                pending.append(dependency)
+    return found
+
+
+def initialize(container, parallel=True, workers=None):
+    """
+        Builds every eager singleton of the container in dependency order. With 'parallel' a
+        singleton is submitted to a thread pool as soon as the singletons it depends on are built,
+        so independent constructions overlap. A failure does not stop the others; the singletons
+        that depend on a failed one are skipped, and everything is reported in one
+        InitializationError. Returns the instances, in registration order.
+    """
+    bindings = eager_singletons(container)
+    eager = set(bindings)
+    dependencies = {binding: singleton_dependencies(container, binding, eager) for binding in bindings}
+    dependents = {binding: [] for binding in bindings}
+    for binding, needed in dependencies.items():
+        for dependency in needed:
+            dependents[dependency].append(binding)
+    waiting = {binding: len(needed) for binding, needed in dependencies.items()}
+    ready = [binding for binding in bindings if not waiting[binding]]
+    instances = {}
+    errors = []
+    failed = set()
+
+    def build(binding):
+        return container._bind(binding, ())()
+
+    def finished(binding, error=None):
+        if error is not None:
+            errors.append((binding, error))
+            failed.add(binding)
+        for dependent in dependents[binding]:
+            waiting[dependent] -= 1
+            if binding in failed:
+                failed.add(dependent)
+            if not waiting[dependent]:
+                ready.append(dependent)
+
+    def settle(binding):
+        """Skips a binding whose dependency failed; returns True when it can be built."""
+        if binding in failed:
+            finished(binding)
+            return False
+        return True
+
+    if parallel and len(bindings) > 1:
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="injector-init") as executor:
+            running = {}
+            while ready or running:
+                while ready:
+                    binding = ready.pop(0)
+                    if settle(binding):
+                        running[executor.submit(build, binding)] = binding
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    binding = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        instances[binding] = future.result()
+                    finished(binding, error)
+    else:
+        while ready:
+            binding = ready.pop(0)
+            if settle(binding):
+                try:
+                    instances[binding] = build(binding)
+                except Exception as error:
+                    finished(binding, error)
+                else:
+                    finished(binding)
+
+    # Bindings in a cycle never become ready; building them reports the CircularDependencyError.
+    for binding in bindings:
+        if waiting[binding] and binding not in failed:
+            try:
+                instances[binding] = build(binding)
+            except Exception as error:
+                errors.append((binding, error))
+                failed.add(binding)
+
+    if errors:
+        errored = {binding for binding, _ in errors}
+        raise InitializationError(errors, [binding for binding in bindings if binding in failed and binding not in errored])
+    return [instances[binding] for binding in bindings]
+
+
+async def ainitialize(container):
+    """
+        Asynchronous counterpart of 'initialize': every eager singleton, async factories included, is
+        resolved with 'aget' as a concurrent task, so independent async constructions overlap.
+    """
+    import asyncio
+    bindings = [binding for bindings in container._services.values() for binding in bindings
+                if binding.lifecycle == SINGLETON and not binding.lazy]
+    results = await asyncio.gather(
+        *(container.aget(binding.interface, binding.key if binding.key is not None else binding.index) for binding in bindings),
+        return_exceptions=True)
+    errors = [(binding, result) for binding, result in zip(bindings, results) if isinstance(result, Exception)]
+    if errors:
+        raise InitializationError(errors)
+    return results
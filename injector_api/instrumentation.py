@@ -0,0 +1,200 @@
+import collections
+import threading
+import time
+
+# Upper bounds, in seconds, of the construction-time histogram buckets. The last bucket is open.
+HISTOGRAM_BOUNDS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+RECENT_SCOPES = 1024
+
+
+class InstrumentationHook:
+    """
+        Interface for exporters (metrics, tracing, logs). Every method is optional and called
+        synchronously on the resolving thread, so implementations should be cheap.
+    """
+
+    def on_resolve(self, binding, elapsed):
+        """Called after a service has been resolved, with the time the resolution took."""
+
+    def on_construct(self, binding, elapsed, scope_id):
+        """Called after a new instance has been built, with the construction time."""
+
+    def on_scope_end(self, scope_id, allocations):
+        """Called when a scope ends, with the number of instances built while it was active."""
+
+
+class BindingStats:
+    """Counters and construction-time histogram of one binding."""
+    __slots__ = ('binding', 'hits', 'constructions', 'resolve_time', 'construct_time', 'self_construct_time',
+                 'max_construct_time', 'histogram')
+
+    def __init__(self, binding):
+        self.binding = binding
+        self.hits = 0
+        self.constructions = 0
+        self.resolve_time = 0.0
+        self.construct_time = 0.0
+        # Construction time minus the time spent building the dependencies constructed meanwhile.
+        self.self_construct_time = 0.0
+        self.max_construct_time = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    @property
+    def lifecycle(self):
+        return self.binding.lifecycle
+
+    @property
+    def mean_construct_time(self):
+        return self.construct_time / self.constructions if self.constructions else 0.0
+
+    @property
+    def mean_self_construct_time(self):
+        return self.self_construct_time / self.constructions if self.constructions else 0.0
+
+    def as_dict(self):
+        return {
+            "interface": self.binding.name,
+            "index": self.binding.index,
+            "implementation": getattr(self.binding.implementation, '__qualname__', repr(self.binding.implementation)),
+            "lifecycle": self.lifecycle,
+            "hits": self.hits,
+            "constructions": self.constructions,
+            "resolve_time": self.resolve_time,
+            "construct_time": self.construct_time,
+            "self_construct_time": self.self_construct_time,
+            "max_construct_time": self.max_construct_time,
+            "histogram": dict(zip([str(bound) for bound in HISTOGRAM_BOUNDS] + ["inf"], self.histogram)),
+        }
+
+
+class Instrumentation:
+    """
+        Collects per-binding counters, construction-time histograms and per-scope allocation counts.
+        It is only consulted while it is enabled on a container; when disabled, resolvers are bound
+        without any wrapper.
+    """
+
+    def __init__(self, hooks=(), scope_manager=None):
+        self.hooks = list(hooks)
+        self.stats = {}
+        self.scope_allocations = collections.deque(maxlen=RECENT_SCOPES)
+        self._active_scopes = collections.Counter()
+        self._scope_manager = scope_manager
+        self._lock = threading.Lock()
+        # Time spent in nested constructions on this thread, subtracted to get self times.
+        self._nested = threading.local()
+
+    def _stats_for(self, binding):
+        stats = self.stats.get(binding)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.setdefault(binding, BindingStats(binding))
+        return stats
+
+    def resolver(self, binding, resolve):
+        """Wraps a bound resolver to count hits and time resolutions."""
+        stats = self._stats_for(binding)
+        hooks = self.hooks
+
+        def instrumented_resolve():
+            start = time.perf_counter()
+            instance = resolve()
+            elapsed = time.perf_counter() - start
+            stats.hits += 1
+            stats.resolve_time += elapsed
+            for hook in hooks:
+                hook.on_resolve(binding, elapsed)
+            return instance
+
+        return instrumented_resolve
+
+    def constructor(self, binding, factory):
+        """Wraps the factory of a binding to time constructions and count them per scope."""
+        stats = self._stats_for(binding)
+        hooks = self.hooks
+        scope_manager = self._scope_manager
+        active_scopes = self._active_scopes
+        nested = self._nested
+
+        def instrumented_factory(*args, **kwargs):
+            outer = getattr(nested, 'time', 0.0)
+            nested.time = 0.0
+            start = time.perf_counter()
+            try:
+                instance = factory(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                own = elapsed - nested.time
+                nested.time = outer + elapsed
+            self.record_construction(stats, elapsed, own)
+            scope = scope_manager.get_current_scope() if scope_manager is not None else None
+            scope_id = scope.id if scope is not None else None
+            if scope_id is not None:
+                active_scopes[scope_id] += 1
+            for hook in hooks:
+                hook.on_construct(binding, elapsed, scope_id)
+            return instance
+
+        return instrumented_factory
+
+    def record_construction(self, stats, elapsed, own=None):
+        """Adds one construction to the counters and histogram of a binding."""
+        stats.constructions += 1
+        stats.construct_time += elapsed
+        stats.self_construct_time += elapsed if own is None else own
+        if elapsed > stats.max_construct_time:
+            stats.max_construct_time = elapsed
+        for position, bound in enumerate(HISTOGRAM_BOUNDS):
+            if elapsed <= bound:
+                stats.histogram[position] += 1
+                break
+        else:
+            stats.histogram[-1] += 1
+
+    def scope_ended(self, scope_id):
+        """Records the allocations of a scope that just ended."""
+        allocations = self._active_scopes.pop(scope_id, 0)
+        self.scope_allocations.append(allocations)
+        for hook in self.hooks:
+            hook.on_scope_end(scope_id, allocations)
+        return allocations
+
+    def hottest(self, limit=10):
+        """Returns the stats of the most resolved bindings."""
+        return sorted(self.stats.values(), key=lambda stats: stats.hits, reverse=True)[:limit]
+
+    def slowest(self, limit=10):
+        """Returns the stats of the bindings with the highest total construction time."""
+        built = [stats for stats in self.stats.values() if stats.constructions]
+        return sorted(built, key=lambda stats: stats.construct_time, reverse=True)[:limit]
+
+    def snapshot(self):
+        """Returns every counter as plain data, for exporters."""
+        allocations = list(self.scope_allocations)
+        return {
+            "bindings": [stats.as_dict() for stats in self.stats.values()],
+            "scopes": {
+                "count": len(allocations),
+                "mean_allocations": sum(allocations) / len(allocations) if allocations else 0.0,
+                "max_allocations": max(allocations, default=0),
+            },
+        }
+
+    def report(self, limit=10):
+        """Returns a text report ranking the hottest and the slowest bindings."""
+        lines = ["Hottest bindings:", f"  {'binding':<40} {'lifecycle':<10} {'hits':>10} {'built':>8} {'resolve us':>11}"]
+        for stats in self.hottest(limit):
+            mean = stats.resolve_time / stats.hits * 1e6 if stats.hits else 0.0
+            lines.append(f"  {self._label(stats):<40} {stats.lifecycle:<10} {stats.hits:>10} {stats.constructions:>8} {mean:>11.2f}")
+        lines += ["Slowest bindings:", f"  {'binding':<40} {'lifecycle':<10} {'built':>8} {'mean ms':>9} {'max ms':>9} {'total ms':>10}"]
+        for stats in self.slowest(limit):
+            lines.append(f"  {self._label(stats):<40} {stats.lifecycle:<10} {stats.constructions:>8} "
+                         f"{stats.mean_construct_time * 1e3:>9.3f} {stats.max_construct_time * 1e3:>9.3f} {stats.construct_time * 1e3:>10.3f}")
+        scopes = self.snapshot()["scopes"]
+        lines.append(f"Scopes: {scopes['count']} ended, {scopes['mean_allocations']:.1f} instances built per scope "
+                     f"(max {scopes['max_allocations']})")
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _label(stats):
+        return f"{stats.binding.name}[{stats.binding.index}]"
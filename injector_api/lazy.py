@@ -0,0 +1,138 @@
+import operator
+
+_MISSING = object()
+
+
+class LazyProxy:
+    """
+        Lightweight stand-in for a service that is only built on first use.
+        The first attribute access (or call, iteration, ...) resolves the real instance,
+        and every later operation is forwarded to it.
+        '__class__' reports 'cls' (then the class of the real instance), so isinstance() checks
+        pass without building the service; type(proxy) is still LazyProxy.
+        Python looks special methods up on the type, so the proxy forwards them explicitly: the
+        (async) context manager protocols, comparisons, containers and the arithmetic operators.
+        It does not define '__await__', which would make every proxy look awaitable; resolve an
+        awaitable service before awaiting it.
+    """
+    __slots__ = ('_lazy_resolve', '_lazy_instance', '_lazy_class')
+
+    def __init__(self, resolve, cls=None):
+        object.__setattr__(self, '_lazy_resolve', resolve)
+        object.__setattr__(self, '_lazy_instance', _MISSING)
+        object.__setattr__(self, '_lazy_class', cls)
+
+    def _lazy_target(self):
+        instance = object.__getattribute__(self, '_lazy_instance')
+        if instance is _MISSING:
+            instance = object.__getattribute__(self, '_lazy_resolve')()
+            object.__setattr__(self, '_lazy_instance', instance)
+        return instance
+
+    @property
+    def __class__(self):
+        instance = object.__getattribute__(self, '_lazy_instance')
+        if instance is _MISSING:
+            cls = object.__getattribute__(self, '_lazy_class')
+            if cls is not None:
+                return cls
+            instance = self._lazy_target()
+        return type(instance)
+
+    @property
+    def is_resolved(self):
+        """True once the real instance has been built."""
+        return object.__getattribute__(self, '_lazy_instance') is not _MISSING
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_target(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_target(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._lazy_target(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._lazy_target()(*args, **kwargs)
+
+    def __repr__(self):
+        if not self.is_resolved:
+            return f"<LazyProxy of {object.__getattribute__(self, '_lazy_resolve')!r}>"
+        return repr(self._lazy_target())
+
+    def __bool__(self):
+        return bool(self._lazy_target())
+
+    def __len__(self):
+        return len(self._lazy_target())
+
+    def __iter__(self):
+        return iter(self._lazy_target())
+
+    def __contains__(self, item):
+        return item in self._lazy_target()
+
+    def __getitem__(self, key):
+        return self._lazy_target()[key]
+
+    def __setitem__(self, key, value):
+        self._lazy_target()[key] = value
+
+    def __delitem__(self, key):
+        del self._lazy_target()[key]
+
+    def __str__(self):
+        return str(self._lazy_target())
+
+    def __eq__(self, other):
+        return self._lazy_target() == other
+
+    def __ne__(self, other):
+        return self._lazy_target() != other
+
+    def __lt__(self, other):
+        return self._lazy_target() < other
+
+    def __le__(self, other):
+        return self._lazy_target() <= other
+
+    def __gt__(self, other):
+        return self._lazy_target() > other
+
+    def __ge__(self, other):
+        return self._lazy_target() >= other
+
+    def __hash__(self):
+        return hash(self._lazy_target())
+
+    def __enter__(self):
+        return self._lazy_target().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._lazy_target().__exit__(exc_type, exc_value, traceback)
+
+    def __aenter__(self):
+        return self._lazy_target().__aenter__()
+
+    def __aexit__(self, exc_type, exc_value, traceback):
+        return self._lazy_target().__aexit__(exc_type, exc_value, traceback)
+
+
+def _forward_operator(operation, reflected=False):
+    if reflected:
+        def method(self, other):
+            return operation(other, self._lazy_target())
+    else:
+        def method(self, *other):
+            return operation(self._lazy_target(), *other)
+    return method
+
+
+for _name in ('add', 'sub', 'mul', 'matmul', 'truediv', 'floordiv', 'mod', 'pow', 'lshift', 'rshift', 'and', 'or', 'xor'):
+    _operation = getattr(operator, f'__{_name}__')
+    setattr(LazyProxy, f'__{_name}__', _forward_operator(_operation))
+    setattr(LazyProxy, f'__r{_name}__', _forward_operator(_operation, reflected=True))
+for _name in ('neg', 'pos', 'abs', 'invert', 'index'):
+    setattr(LazyProxy, f'__{_name}__', _forward_operator(getattr(operator, f'__{_name}__')))
+del _name, _operation
@@ -1,9 +1,12 @@
 import os
+import re
+import sys
 import importlib.util
-import json
-import logging
-
-logger = logging.getLogger(__name__)
+import inspect
+import threading
+from functools import wraps
+from .container import container
+from .binding import injectable_parameters, injection_key, injection_target
 
 
 DEFAULT_CONFIG = {
@@ -13,11 +16,18 @@ DEFAULT_CONFIG = {
 CONFIG_FILE_NAME = "injectorConfig.json"
 USE_CONFIGURE = False
 LOADED_MODULES_CACHE = []
+LOADED_MODULES_MANIFEST = {}
+MODULE_NAMESPACE = "injector_api_modules"
 MODULE_APPLICATION = None
+# Serialises reloads, e.g. a ModuleWatcher and an explicit container.reload().
+_reload_lock = threading.Lock()
 
 def load_config_from_file():
     global MODULE_APPLICATION
     if MODULE_APPLICATION is None:
+        import json
+        import logging
+        logger = logging.getLogger(__name__)
         try:
             with open(CONFIG_FILE_NAME, 'r') as file:
                 config_data = json.load(file)
@@ -41,88 +51,274 @@ def get_module_application():
         load_config_from_file()
     return MODULE_APPLICATION
 
+def _module_name_for(directory, module_path):
+    """
+    Returns the unique name under which a module file is registered in sys.modules. A hash of the
+    absolute directory keeps apart directories with the same name in different places.
+    """
+    import hashlib
+    directory = os.path.normpath(os.path.abspath(directory))
+    relative = os.path.relpath(module_path, directory)
+    digest = hashlib.sha1(directory.encode()).hexdigest()[:10]
+    parts = [f"{os.path.basename(directory)}_{digest}"]
+    parts += os.path.splitext(relative)[0].split(os.sep)
+    return MODULE_NAMESPACE + '.' + '.'.join(re.sub(r'\W', '_', part) or '_' for part in parts)
+
+
+def _find_module_files(directory, module_name):
+    """Walks the directory tree, in a stable order, and returns the paths of the module files."""
+    module_paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        if module_name in files:
+            module_paths.append(os.path.join(root, module_name))
+    return module_paths
+
+
+def _prepare_module(directory, module_path):
+    """Stats a module file and gets its code object, unless it is unchanged since it was loaded."""
+    stat = os.stat(module_path)
+    entry = LOADED_MODULES_MANIFEST.get(module_path)
+    if entry is not None and entry[0] == stat.st_mtime and entry[1] == stat.st_size:
+        return module_path, stat, None, None
+    spec = importlib.util.spec_from_file_location(_module_name_for(directory, module_path), module_path)
+    return module_path, stat, spec, spec.loader.get_code(spec.name)
+
+
 def load_modules_from_subdirectories(directory, module_name="module.py", use_cache=True):
     """
     Dynamically loads all modules with a specific name from the subdirectories of a given directory.
+    Each module is registered in sys.modules under a unique name derived from its path. Modules are
+    executed one by one, in path order, so registrations keep their order.
+    Once the directory is loaded, 'use_cache=False' goes through 'reload_modules': a manifest of file
+    mtimes and sizes means only the modules that changed are executed again, and their registrations
+    replace the previous ones instead of being added on top of them.
     """
     global LOADED_MODULES_CACHE
 
     if use_cache and LOADED_MODULES_CACHE:
         return LOADED_MODULES_CACHE
 
+    module_paths = _find_module_files(directory, module_name)
+    if any(path in LOADED_MODULES_MANIFEST for path in module_paths):
+        reload_modules(directory, module_name)
+        return LOADED_MODULES_CACHE
+    try:
+        prepared = [_prepare_module(directory, path) for path in module_paths]
+    except Exception as e:
+        raise ImportError(f"Error importing file '{getattr(e, 'filename', directory)}'. Original error message: {str(e)}")
+
     loaded_modules = []
+    for module_path, stat, spec, code in prepared:
+        if spec is None:
+            loaded_modules.append(LOADED_MODULES_MANIFEST[module_path][2])
+            continue
+        module = _exec_module(module_path, spec, code)
+        LOADED_MODULES_MANIFEST[module_path] = (stat.st_mtime, stat.st_size, module)
+        loaded_modules.append(module)
 
-    for root, dirs, files in os.walk(directory):
-        if module_name in files:
-            module_path = os.path.join(root, module_name)
+    LOADED_MODULES_CACHE = loaded_modules
+    return loaded_modules
+
+
+def _exec_module(module_path, spec, code):
+    """Executes a prepared module file; the container records the file as the source of its registrations."""
+    module = importlib.util.module_from_spec(spec)
+    previous = sys.modules.get(spec.name)
+    sys.modules[spec.name] = module
+    container._registering.source = module_path
+    try:
+        exec(code, module.__dict__)
+    except Exception as e:
+        if previous is None:
+            sys.modules.pop(spec.name, None)
+        else:
+            sys.modules[spec.name] = previous
+        raise ImportError(f"Error importing file '{module_path}'. Original error message: {str(e)}")
+    finally:
+        container._registering.source = None
+    return module
+
+
+def reload_modules(directory, module_name="module.py"):
+    """
+    Re-executes the module files under 'directory' whose mtime or size changed and applies the
+    difference of their registrations to the container; files that were deleted lose their bindings.
+    If a module fails the registry is left as it was and ImportError is raised.
+    Returns {"modules": reloaded paths, "added": [...], "removed": [...], "rebuilt": [...]} where the
+    last three are Bindings; "rebuilt" are the singletons dropped so they are built again.
+    """
+    with _reload_lock:
+        return _reload_modules(directory, module_name)
+
+
+def _reload_modules(directory, module_name):
+    global LOADED_MODULES_CACHE
+
+    module_paths = _find_module_files(directory, module_name)
+    try:
+        prepared = [_prepare_module(directory, path) for path in module_paths]
+    except Exception as e:
+        raise ImportError(f"Error importing file '{getattr(e, 'filename', directory)}'. Original error message: {str(e)}")
+    root = os.path.join(os.path.abspath(directory), '')
+    deleted = [path for path in LOADED_MODULES_MANIFEST
+               if os.path.abspath(path).startswith(root) and path not in module_paths]
+    changed = [entry for entry in prepared if entry[2] is not None]
+    if not changed and not deleted:
+        LOADED_MODULES_CACHE = [LOADED_MODULES_MANIFEST[path][2] for path in module_paths]
+        return {"modules": [], "added": [], "removed": [], "rebuilt": []}
+
+    modules = {}
+    sources = {entry[0] for entry in changed} | set(deleted)
+    container._begin_staging()
+    try:
+        for module_path, stat, spec, code in changed:
+            modules[module_path] = (stat.st_mtime, stat.st_size, _exec_module(module_path, spec, code))
+        added, removed, rebuilt = container._apply_staged(sources, module_paths)
+    except BaseException:
+        container._abort_staging()
+        # The registry is unchanged, so the previous modules stay the loaded ones.
+        for module_path, (_, _, module) in modules.items():
+            entry = LOADED_MODULES_MANIFEST.get(module_path)
+            if entry is not None:
+                sys.modules[module.__name__] = entry[2]
+            else:
+                sys.modules.pop(module.__name__, None)
+        raise
+
+    for path in deleted:
+        sys.modules.pop(LOADED_MODULES_MANIFEST.pop(path)[2].__name__, None)
+    LOADED_MODULES_MANIFEST.update(modules)
+    LOADED_MODULES_CACHE = [LOADED_MODULES_MANIFEST[path][2] for path in module_paths]
+    return {"modules": sorted(sources), "added": added, "removed": removed, "rebuilt": rebuilt}
+
+
+class ModuleWatcher:
+    """Polls a directory and calls 'reload_modules' when a module file changes. Errors are logged."""
+
+    def __init__(self, directory, interval=1.0, module_name="module.py"):
+        self.directory = directory
+        self.interval = interval
+        self.module_name = module_name
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="injector-module-watcher", daemon=True)
+
+    def start_watching(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
             try:
-                # Cargar el módulo dinámicamente
-                spec = importlib.util.spec_from_file_location(module_name, module_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                loaded_modules.append(module)
-            except Exception as e:
-                raise ImportError(f"Error importing file '{module_path}'. Original error message: {str(e)}")
+                reload_modules(self.directory, self.module_name)
+            except Exception:
+                import logging
+                logging.getLogger(__name__).exception("Reloading the modules of %s failed", self.directory)
 
-    LOADED_MODULES_CACHE = loaded_modules
+
+def load_wiring(path):
+    """Registers the bindings of a wiring module generated with container.export_wiring."""
+    from .compiler import load_wiring as _load_wiring
+    return _load_wiring(path, container)
 
 
-def initializate(application):
+def initializate(application, wiring=None):
+    """
+    Loads the module.py files of the application. If 'wiring' points to an existing module generated
+    with container.export_wiring, it is imported instead and the module.py files are not executed.
+    """
     configure(module_application=application)
-    desired_directory = os.path.join(parent_directory, get_module_application())
+    if wiring is not None and os.path.exists(wiring):
+        load_wiring(wiring)
+        return
+    desired_directory = os.path.join(get_parent_directory(), get_module_application())
     load_modules_from_subdirectories(desired_directory, use_cache=True)
 
-parent_directory = os.getcwd() 
+# Directory the application package is looked up in; the working directory at first use.
+parent_directory = None
+
+def get_parent_directory():
+    global parent_directory
+    if parent_directory is None:
+        parent_directory = os.getcwd()
+    return parent_directory
 
 def start():
-    desired_directory = os.path.join(parent_directory, get_module_application())
+    desired_directory = os.path.join(get_parent_directory(), get_module_application())
     load_modules_from_subdirectories(desired_directory, use_cache=True)
 
-def inject(interface_index_mapping=None):
+def inject(interface_index_mapping=None, lazy=None):
     """
-    A decorator that handles dependency injection for functions and class methods based on their type hints.
+    A decorator that handles dependency injection for functions, coroutine functions and class methods
+    based on their type hints.
+    The parameters to inject and their resolvers are compiled into a plan on the first call, and the plan
+    is only rebuilt when the container registry changes. The mapping selects an implementation by index
+    or by key ({IExampleService: "redis"}); an Annotated[IExampleService, "redis"] hint takes precedence.
+    Arguments passed explicitly by the caller are never replaced. When several parameters are injected,
+    some of them scoped, and the caller passed none of them, they are resolved together through a
+    container bundle.
+    With 'lazy=True' singletons that are not built yet are injected as a LazyProxy, and with
+    'lazy=False' the 'lazy' flag of the registrations is ignored.
     """
-    
-    import inspect
-    from functools import wraps
-    
+    if callable(interface_index_mapping) and not isinstance(interface_index_mapping, dict):
+        return inject()(interface_index_mapping)
+
     if interface_index_mapping is None:
         interface_index_mapping = {}
-    
-    
-        
-  
+
     def decorator(func):
-        
-        params = inspect.signature(func).parameters
-        param_names = list(params.keys())
+        candidates = [(position, name, injection_target(annotation), injection_key(annotation))
+                      for position, name, annotation in injectable_parameters(func)]
+        # [registry version the plan was compiled for, plan, names, bundle, first injected position]
+        state = [None, (), (), None, 0]
+
+        def compile_plan():
+            plan = []
+            items = []
+            for position, name, interface, key in candidates:
+                if interface is not None and interface in container._services:
+                    index = key if key is not None else interface_index_mapping.get(interface, 0)
+                    plan.append((position, name, container.resolver(interface, index, lazy)))
+                    items.append((interface, index))
+            names = tuple(name for _, name, _ in plan)
+            # Only worth it when scoped instances can be read straight from the scope; otherwise
+            # the per-parameter loop is faster than building the list and zipping it.
+            steps = container._bundle_steps(items, lazy) if len(plan) > 1 else ()
+            bundle = container._resolve_steps(steps) if any(binding is not None for binding, _ in steps) else None
+            first = min((position for position, _, _ in plan), default=0)
+            state[:] = [container._version, tuple(plan), names, bundle, first]
+            return state
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                version, plan, names, bundle, first = state if state[0] == container._version else compile_plan()
+                nargs = len(args)
+                if bundle is not None and nargs <= first and not kwargs:
+                    kwargs = dict(zip(names, bundle()))
+                else:
+                    for position, name, resolve in plan:
+                        if position >= nargs and name not in kwargs:
+                            kwargs[name] = resolve()
+                return await func(*args, **kwargs)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            from .container import container
-            
-            # Determine if this is a class method by checking if the first argument is an instance of a class
-            is_class_method = len(args) > 0 and isinstance(args[0], type(args[0]))
-
-            args_list = list(args)
-
-            for name, param in params.items():
-                if param.annotation.__name__ in container._services:
-
-                    index = interface_index_mapping.get(param.annotation, 0)
-                    service = container.get(param.annotation, index)
-                    
-                    if service:
-                        arg_position = param_names.index(name)
-                        # Adjust for 'self' if this is a class method
-                        if is_class_method:
-                            arg_position += 1
-
-                        if arg_position < len(args_list):
-                            args_list[arg_position] = service
-                        else:
-                            kwargs[name] = service
-
-            return func(*args_list, **kwargs)
+            version, plan, names, bundle, first = state if state[0] == container._version else compile_plan()
+            nargs = len(args)
+            if bundle is not None and nargs <= first and not kwargs:
+                kwargs = dict(zip(names, bundle()))
+            else:
+                for position, name, resolve in plan:
+                    if position >= nargs and name not in kwargs:
+                        kwargs[name] = resolve()
+            return func(*args, **kwargs)
 
         return wrapper
 
@@ -1,3 +1,4 @@
+import inspect
 from .container import container
 class ScopeMiddleware:
     """
@@ -7,12 +8,8 @@ class ScopeMiddleware:
         self.get_response = get_response
 
     def __call__(self, request, *args, **kwargs):
-        container.start_scope()
-        try:
-            response = self.handle_request(request, *args, **kwargs)
-        finally:
-            container.end_scope()
-        return response
+        with container.scope(nested=False):
+            return self.handle_request(request, *args, **kwargs)
 
     def handle_request(self, request, *args, **kwargs):
         if self.get_response:
@@ -21,17 +18,36 @@ class ScopeMiddleware:
     
     
 class ScoperMiddlewareManual:
-    
+    """Runs functions inside a scope, nested in the current scope when there is one."""
+
     @staticmethod
     def start(*funcs)->None:
-        container.start_scope()
-        try:
+        with container.scope():
             for func in funcs:
                 func()
-        finally:
-            container.end_scope()
-    
-        
-        
-        
-        
+
+
+class AsyncScopeMiddleware:
+    """
+        ASGI middleware that runs every HTTP or websocket request inside its own scope.
+        The scope is bound to the asyncio task serving the request, so concurrent requests do not share it.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope.get("type") not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        async with container.scope(nested=False):
+            return await self.app(scope, receive, send)
+
+
+class AsyncScoperMiddlewareManual:
+
+    @staticmethod
+    async def start(*funcs)->None:
+        async with container.scope():
+            for func in funcs:
+                result = func()
+                if inspect.isawaitable(result):
+                    await result
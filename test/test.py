@@ -1,9 +1,34 @@
+import asyncio
+import gc
 import unittest
 import sys
 import os
+import importlib
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+try:
+    from typing import Annotated
+except ImportError:  # Python < 3.9
+    Annotated = None
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from injector_api import DependencyContainer, load_modules_from_subdirectories, inject,TRANSIENT,SCOPED
+from injector_api import DependencyContainer, load_modules_from_subdirectories, inject,container,TRANSIENT,SCOPED,POOLED,MEMOIZED
+from injector_api import AsyncScopeMiddleware, ScoperMiddlewareManual, ScopedExecutor
+from injector_api.dependencyError import CircularDependencyError, ConfigurationError, InitializationError, RegistrationError
+from injector_api.compiler import load_wiring
+from injector_api.instrumentation import InstrumentationHook
+from injector_api.lazy import LazyProxy
+
+# The search modules import the classes below from 'test.test'. The registry is keyed by the
+# interface type, so that name has to refer to this module however the file was loaded.
+sys.modules.setdefault("test.test", sys.modules[__name__])
 
 # Interfaces y clases de ejemplo para las pruebas
 class IService:
@@ -70,5 +95,1218 @@ class DependencyTests(unittest.TestCase):
         result = function_with_dependency()
         self.assertEqual(result, "transient data")
 
+class IPlanService:
+    pass
+
+class PlanServiceImpl(IPlanService):
+    pass
+
+class IExplicitService:
+    pass
+
+class ExplicitServiceImpl(IExplicitService):
+    pass
+
+
+class InjectionPlanTests(unittest.TestCase):
+    def test_plan_is_recompiled_when_registry_changes(self):
+        @inject
+        def handler(value, service: IPlanService = None, *, other: IPlanService = None):
+            return service, other
+
+        self.assertEqual(handler(1), (None, None))
+        container.register(IPlanService, PlanServiceImpl, lifecycle=TRANSIENT, override=True)
+        service, other = handler(1)
+        self.assertIsInstance(service, PlanServiceImpl)
+        self.assertIsInstance(other, PlanServiceImpl)
+
+    def test_explicit_arguments_are_not_replaced(self):
+        container.register(IExplicitService, ExplicitServiceImpl, override=True)
+
+        @inject({IExplicitService: 0})
+        def handler(service: IExplicitService):
+            return service
+
+        explicit = ExplicitServiceImpl()
+        self.assertIs(handler(explicit), explicit)
+        self.assertIs(handler(service=explicit), explicit)
+
+
+class IRepository:
+    pass
+
+class Repository(IRepository):
+    pass
+
+class IUseCase:
+    pass
+
+class UseCase(IUseCase):
+    def __init__(self, repository: IRepository, name="use case"):
+        self.repository = repository
+        self.name = name
+
+class IHandler:
+    pass
+
+class Handler(IHandler):
+    def __init__(self, use_case: IUseCase):
+        self.use_case = use_case
+
+class ICycleA:
+    pass
+
+class ICycleB:
+    pass
+
+class CycleA(ICycleA):
+    def __init__(self, other: ICycleB):
+        pass
+
+class CycleB(ICycleB):
+    def __init__(self, other: ICycleA):
+        pass
+
+
+class AutoWiringTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+
+    def test_constructor_dependencies_are_resolved_recursively(self):
+        self.container.register(IRepository, Repository)
+        self.container.register(IUseCase, UseCase, lifecycle=TRANSIENT)
+        self.container.register(IHandler, Handler, lifecycle=TRANSIENT)
+        handler = self.container.get(IHandler)
+        self.assertIsInstance(handler.use_case, UseCase)
+        self.assertIs(handler.use_case.repository, self.container.get(IRepository))
+
+    def test_caller_arguments_take_precedence(self):
+        self.container.register(IRepository, Repository)
+        self.container.register(IUseCase, UseCase, lifecycle=TRANSIENT)
+        repository = Repository()
+        use_case = self.container.get(IUseCase, 0, repository, name="custom")
+        self.assertIs(use_case.repository, repository)
+        self.assertEqual(use_case.name, "custom")
+
+    def test_circular_dependencies_are_reported(self):
+        self.container.register(ICycleA, CycleA)
+        self.container.register(ICycleB, CycleB)
+        with self.assertRaises(CircularDependencyError) as context:
+            self.container.get(ICycleA)
+        self.assertIn("ICycleA -> ICycleB -> ICycleA", str(context.exception))
+
+
+class SlowSingleton(IService):
+    constructions = 0
+
+    def __init__(self):
+        time.sleep(0.02)
+        SlowSingleton.constructions += 1
+
+
+class ThreadSafetyTests(unittest.TestCase):
+    def test_singleton_is_constructed_once_across_threads(self):
+        container = DependencyContainer()
+        container.register(IService, SlowSingleton)
+        SlowSingleton.constructions = 0
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(container.get(IService))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(SlowSingleton.constructions, 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+
+
+class IRequestState:
+    pass
+
+class RequestState(IRequestState):
+    pass
+
+
+class AsyncScopeTests(unittest.TestCase):
+    def test_concurrent_tasks_have_isolated_scopes(self):
+        container.register(IRequestState, RequestState, lifecycle=SCOPED, override=True)
+        seen = []
+
+        @inject
+        async def handler(state: IRequestState):
+            await asyncio.sleep(0)
+            return state
+
+        async def app(scope, receive, send):
+            first = await handler()
+            await asyncio.sleep(0.01 * scope["delay"])
+            second = await handler()
+            seen.append((first, second))
+
+        middleware = AsyncScopeMiddleware(app)
+
+        async def main():
+            await asyncio.gather(*(middleware({"type": "http", "delay": delay}, None, None) for delay in (2, 0, 1)))
+
+        asyncio.run(main())
+        self.assertEqual(len(seen), 3)
+        for first, second in seen:
+            self.assertIs(first, second)
+        self.assertEqual(len(set(id(first) for first, _ in seen)), 3)
+
+
+class IConfig:
+    pass
+
+class IPool:
+    pass
+
+class Gateway:
+    def __init__(self, config, pool):
+        self.config = config
+        self.pool = pool
+
+
+class AsyncResolutionTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+        self.constructions = 0
+
+    async def load_config(self):
+        self.constructions += 1
+        await asyncio.sleep(0.05)
+        return {"dsn": "memory"}
+
+    def test_concurrent_aget_shares_singleton_construction(self):
+        self.container.register_factory(IConfig, self.load_config)
+
+        async def main():
+            return await asyncio.gather(*(self.container.aget(IConfig) for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(self.constructions, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertIs(self.container.get(IConfig), results[0])
+
+    def test_independent_dependencies_are_resolved_concurrently(self):
+        async def open_pool():
+            await asyncio.sleep(0.05)
+            return "pool"
+
+        async def build_gateway(config: IConfig, pool: IPool):
+            return Gateway(config, pool)
+
+        self.container.register_factory(IConfig, self.load_config)
+        self.container.register_factory(IPool, open_pool)
+        self.container.register_factory(IService, build_gateway, lifecycle=TRANSIENT)
+
+        start = time.perf_counter()
+        gateway = asyncio.run(self.container.aget(IService))
+        self.assertLess(time.perf_counter() - start, 0.09)
+        self.assertEqual(gateway.pool, "pool")
+        self.assertEqual(gateway.config, {"dsn": "memory"})
+
+    def test_sync_get_of_async_factory_is_rejected(self):
+        self.container.register_factory(IConfig, self.load_config)
+        with self.assertRaises(ConfigurationError):
+            self.container.get(IConfig)
+
+
+class ICursor:
+    pass
+
+class IConnection:
+    pass
+
+class Connection(IConnection):
+    closed = []
+
+    def close(self):
+        Connection.closed.append(self)
+
+class Cursor(ICursor):
+    def __init__(self, connection: IConnection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        Connection.closed.append(self)
+
+class Buffer(IService):
+    created = 0
+
+    def __init__(self):
+        Buffer.created += 1
+        self.data = []
+
+    def reset(self):
+        self.data.clear()
+
+
+class ScopeDisposalTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+        Connection.closed = []
+
+    def test_scoped_instances_are_disposed_in_reverse_creation_order(self):
+        self.container.register(IConnection, Connection, lifecycle=SCOPED)
+        self.container.register(ICursor, Cursor, lifecycle=SCOPED)
+        self.container.start_scope()
+        cursor = self.container.get(ICursor)
+        self.container.end_scope()
+        self.assertEqual(Connection.closed, [cursor, cursor.connection])
+
+    def test_pooled_instances_are_reset_and_reused_across_scopes(self):
+        self.container.register(IService, Buffer, lifecycle=POOLED, pool_size=1)
+        Buffer.created = 0
+        self.container.start_scope()
+        first = self.container.get(IService)
+        first.data.append(1)
+        self.container.end_scope()
+
+        self.container.start_scope()
+        second = self.container.get(IService)
+        self.container.end_scope()
+        self.assertIs(first, second)
+        self.assertEqual(second.data, [])
+        self.assertEqual(Buffer.created, 1)
+
+
+class TypeKeyedRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+
+    def test_interfaces_with_the_same_name_do_not_collide(self):
+        first = types.new_class("IStorage")
+        second = types.new_class("IStorage")
+        self.container.register(first, types.new_class("Disk", (first,)))
+        self.container.register(second, types.new_class("Cloud", (second,)))
+        self.assertEqual(type(self.container.get(first)).__name__, "Disk")
+        self.assertEqual(type(self.container.get(second)).__name__, "Cloud")
+
+    def test_optional_and_forward_references_are_resolved(self):
+        self.container.register(IRepository, Repository)
+
+        class Consumer(IService):
+            def __init__(self, repository: Optional[IRepository], other: "IRepository" = None):
+                self.repository = repository
+                self.other = other
+
+        self.container.register(IService, Consumer, lifecycle=TRANSIENT)
+        consumer = self.container.get(IService)
+        self.assertIs(consumer.repository, self.container.get(Optional[IRepository]))
+        self.assertIs(consumer.other, consumer.repository)
+
+
+class IModelLoader:
+    pass
+
+class ModelLoader(IModelLoader):
+    constructions = 0
+
+    def __init__(self):
+        ModelLoader.constructions += 1
+
+    def predict(self):
+        return "prediction"
+
+
+class LazyProxyTests(unittest.TestCase):
+    def test_lazy_singleton_is_built_on_first_use(self):
+        container.register(IModelLoader, ModelLoader, override=True, lazy=True)
+        ModelLoader.constructions = 0
+
+        @inject({IModelLoader: -1})
+        def handler(loader: IModelLoader, use=False):
+            return loader.predict() if use else loader
+
+        proxy = handler()
+        self.assertIsInstance(proxy, IModelLoader)
+        self.assertIsInstance(proxy, ModelLoader)
+        self.assertIs(type(proxy), LazyProxy)
+        self.assertEqual(ModelLoader.constructions, 0)
+        self.assertEqual(handler(use=True), "prediction")
+        self.assertEqual(ModelLoader.constructions, 1)
+        self.assertIsInstance(handler(), ModelLoader)
+        self.assertTrue(proxy.is_resolved)
+
+    def test_proxy_forwards_protocols_looked_up_on_the_type(self):
+        class Session:
+            def __init__(self):
+                self.events = []
+
+            def __enter__(self):
+                self.events.append("enter")
+                return self
+
+            def __exit__(self, *exc_info):
+                self.events.append("exit")
+
+            async def __aenter__(self):
+                return self.__enter__()
+
+            async def __aexit__(self, *exc_info):
+                self.__exit__(*exc_info)
+
+        session = LazyProxy(Session, Session)
+        with session as entered:
+            self.assertIsInstance(entered, Session)
+
+        async def main():
+            async with session:
+                pass
+
+        asyncio.run(main())
+        self.assertEqual(session.events, ["enter", "exit", "enter", "exit"])
+
+        number = LazyProxy(lambda: 5)
+        self.assertTrue(number < 6 and number >= 5 and number != 4)
+        self.assertEqual((number + 1, 1 + number, -number, number * 2), (6, 6, -5, 10))
+        self.assertEqual(str(number), "5")
+
+    def test_only_singletons_can_be_lazy(self):
+        with self.assertRaises(ConfigurationError):
+            DependencyContainer().register(IModelLoader, ModelLoader, lifecycle=TRANSIENT, lazy=True)
+
+
+LOAD_EVENTS = []
+
+
+class ModuleLoadingTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for app in ("billing", "orders", "users"):
+            os.makedirs(os.path.join(self.root, app))
+            with open(os.path.join(self.root, app, "module.py"), "w") as f:
+                f.write("from test.test import LOAD_EVENTS\nLOAD_EVENTS.append(__name__)\n")
+        del LOAD_EVENTS[:]
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_modules_get_unique_names_and_are_reloaded_incrementally(self):
+        modules = load_modules_from_subdirectories(self.root, use_cache=False)
+        self.assertEqual(len(set(module.__name__ for module in modules)), 3)
+        self.assertTrue(all(sys.modules[module.__name__] is module for module in modules))
+        self.assertEqual(LOAD_EVENTS, [module.__name__ for module in modules])
+
+        with open(os.path.join(self.root, "orders", "module.py"), "a") as f:
+            f.write("# changed\n")
+        reloaded = load_modules_from_subdirectories(self.root, use_cache=False)
+        self.assertEqual(len(LOAD_EVENTS), 4)
+        self.assertTrue(LOAD_EVENTS[-1].endswith("orders.module"))
+        self.assertIs(reloaded[0], modules[0])
+
+    def test_directories_with_the_same_name_get_different_module_names(self):
+        other = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other)
+        twin = os.path.join(other, os.path.basename(self.root))
+        shutil.copytree(self.root, twin)
+        names = [module.__name__ for module in load_modules_from_subdirectories(self.root, use_cache=False)]
+        twin_names = [module.__name__ for module in load_modules_from_subdirectories(twin, use_cache=False)]
+        self.assertEqual(len(set(names) | set(twin_names)), 6)
+        self.assertTrue(all(sys.modules[name].__file__.startswith(self.root) for name in names))
+
+
+def build_use_case(repository: IRepository):
+    return UseCase(repository, name="from factory")
+
+
+class FrozenContainerTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+        self.container.register(IRepository, Repository)
+        self.container.register(IUseCase, UseCase, lifecycle=TRANSIENT)
+        self.container.register_factory(IUseCase, build_use_case, lifecycle=TRANSIENT, override=True)
+
+    def test_frozen_container_resolves_and_rejects_registrations(self):
+        table = self.container.freeze()
+        self.assertEqual(len(table[IUseCase]), 2)
+        self.assertIs(self.container.get(IUseCase).repository, self.container.get(IRepository))
+        self.assertEqual(self.container.get(IUseCase, 1).name, "from factory")
+        with self.assertRaises(RegistrationError):
+            self.container.register(IHandler, Handler)
+
+    def test_exported_wiring_recreates_registrations(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = self.container.export_wiring(os.path.join(directory, "wiring.py"))
+
+        restored = DependencyContainer()
+        load_wiring(path, restored)
+        self.assertIsInstance(restored.get(IRepository), Repository)
+        self.assertEqual(restored.get(IUseCase, 1).name, "from factory")
+
+    def test_wiring_of_unimportable_objects_is_rejected(self):
+        self.container.register_factory(IHandler, lambda: Handler(None))
+        with self.assertRaises(ConfigurationError):
+            self.container.export_wiring(os.path.join(tempfile.gettempdir(), "unused_wiring.py"))
+
+    def test_wiring_of_instances_names_their_interfaces(self):
+        self.container.register_instance(IHandler, Handler(None))
+        with self.assertRaisesRegex(ConfigurationError, "register_instance: IHandler"):
+            self.container.export_wiring(os.path.join(tempfile.gettempdir(), "unused_wiring.py"))
+
+
+class RecordingHook(InstrumentationHook):
+    def __init__(self):
+        self.scopes = []
+
+    def on_scope_end(self, scope_id, allocations):
+        self.scopes.append(allocations)
+
+
+class InstrumentationTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+        self.container.register(IRepository, Repository)
+        self.container.register(IUseCase, UseCase, lifecycle=TRANSIENT)
+
+    def test_counters_histograms_and_scope_allocations(self):
+        hook = RecordingHook()
+        instrumentation = self.container.enable_instrumentation(hooks=[hook])
+        self.container.start_scope()
+        for _ in range(3):
+            self.container.get(IUseCase)
+        self.container.end_scope()
+
+        stats = {stats.binding.interface: stats for stats in instrumentation.stats.values()}
+        self.assertEqual(stats[IUseCase].hits, 3)
+        self.assertEqual(stats[IUseCase].constructions, 3)
+        self.assertEqual(stats[IRepository].constructions, 1)
+        self.assertEqual(sum(stats[IUseCase].histogram), 3)
+        self.assertEqual(hook.scopes, [4])
+        self.assertIn("IUseCase[0]", instrumentation.report())
+        self.assertEqual(stats[IRepository].hits, 3)
+        self.assertEqual(instrumentation.slowest(5)[0].constructions, 3)
+
+    def test_disabled_instrumentation_leaves_resolvers_unwrapped(self):
+        self.container.enable_instrumentation()
+        self.container.disable_instrumentation()
+        self.container.register(IService, ServiceImpl, lifecycle=TRANSIENT)
+        self.assertIs(self.container.resolver(IService), ServiceImpl)
+
+
+class DiscoveryIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.package_name = "discoverypkg_%d" % id(self)
+        package_dir = os.path.join(self.root, self.package_name)
+        os.makedirs(os.path.join(package_dir, "sub"))
+        for path in ("__init__.py", os.path.join("sub", "__init__.py")):
+            open(os.path.join(package_dir, path), "w").close()
+        with open(os.path.join(package_dir, "sub", "impl.py"), "w") as f:
+            f.write("from %s.other import IRemote\n\nclass NamedService(IRemote):\n    def get_data(self):\n        return 'named'\n" % self.package_name)
+        with open(os.path.join(package_dir, "other.py"), "w") as f:
+            f.write("class IRemote:\n    pass\n")
+        with open(os.path.join(package_dir, "sub", "derived.py"), "w") as f:
+            f.write("# Not registered in the container.\nfrom %s.sub.impl import NamedService as Base\n\nclass DerivedService(Base):\n    pass\n" % self.package_name)
+        with open(os.path.join(package_dir, "sub", "runner.py"), "w") as f:
+            f.write("from %s.other import IRemote\n\nclass DockerRunner(IRemote):\n    def __init__(self):\n"
+                    "        self.container = None\n" % self.package_name)
+        with open(os.path.join(package_dir, "sub", "module.py"), "w") as f:
+            f.write("from injector_api import container as registry\nfrom %s.other import IRemote\n\n"
+                    "class RegisteredService(IRemote):\n    pass\n" % self.package_name)
+        with open(os.path.join(package_dir, "unrelated.py"), "w") as f:
+            f.write("IRemote = None\n\nclass Unrelated:\n    pass\n")
+        sys.path.insert(0, self.root)
+        self.package = importlib.import_module(self.package_name)
+        self.index_path = os.path.join(self.root, "index.json")
+
+    def tearDown(self):
+        sys.path.remove(self.root)
+        for name in [m for m in sys.modules if m.startswith(self.package_name)]:
+            del sys.modules[name]
+        shutil.rmtree(self.root)
+
+    def test_register_by_name_uses_index(self):
+        container = DependencyContainer()
+        container.register_module(self.package, index_path=self.index_path)
+        interface = importlib.import_module(self.package_name + ".other").IRemote
+        container.register(interface, implementation_name="NamedService")
+        self.assertEqual(container.get(interface).get_data(), "named")
+        container.register(interface, implementation_name="DockerRunner", override=True)
+        self.assertIsNone(container.get(interface, 1).container)
+        with open(self.index_path) as f:
+            self.assertEqual(len(json.load(f)["files"]), 6)
+
+    def test_static_scan_imports_only_real_candidates(self):
+        container = DependencyContainer()
+        interface = importlib.import_module(self.package_name + ".other").IRemote
+        matches = container.find_classes_in_package_recursive(self.package, interface)
+        self.assertEqual(sorted(match.__name__ for match in matches), ["DerivedService", "DockerRunner", "NamedService"])
+        self.assertNotIn(self.package_name + ".unrelated", sys.modules)
+        self.assertNotIn(self.package_name + ".sub.module", sys.modules)
+
+    def test_warm_index_only_rescans_changed_files(self):
+        container = DependencyContainer()
+        container.register_module(self.package, index_path=self.index_path)
+        container.discovery_index
+
+        warm = DependencyContainer()
+        warm.register_module(self.package, index_path=self.index_path)
+        index = warm.discovery_index
+        self.assertEqual(index.refresh(), [])
+
+        with open(os.path.join(self.root, self.package_name, "other.py"), "a") as f:
+            f.write("\nclass Added:\n    pass\n")
+        self.assertEqual(len(index.refresh()), 1)
+        self.assertEqual(index.modules_defining("Added"), [self.package_name + ".other"])
+
+class BatchResolutionTests(unittest.TestCase):
+    def test_get_many_resolves_in_order_with_one_scope(self):
+        container = DependencyContainer()
+        container.register(IRepository, Repository)
+        container.register(IRequestState, RequestState, lifecycle=SCOPED)
+        container.register(IService, ServiceImpl)
+        container.register(IService, TransientService, lifecycle=TRANSIENT, override=True)
+        container.start_scope()
+        repository, state, first, second = container.get_many([IRepository, IRequestState, IService, (IService, 1)])
+        self.assertIs(repository, container.get(IRepository))
+        self.assertIs(state, container.get(IRequestState))
+        self.assertIsInstance(first, ServiceImpl)
+        self.assertIsInstance(second, TransientService)
+        container.end_scope()
+        container.start_scope()
+        self.assertIsNot(container.get_many([IRepository, IRequestState])[1], state)
+        container.end_scope()
+
+    def test_inject_bundles_parameters_and_keeps_explicit_arguments(self):
+        container.register(IRepository, Repository, override=True)
+        container.register(IRequestState, RequestState, lifecycle=SCOPED, override=True)
+
+        @inject
+        def handler(repository: IRepository, state: IRequestState):
+            return repository, state
+
+        container.start_scope()
+        repository, state = handler()
+        self.assertIs(repository, container.get(IRepository))
+        self.assertIs(state, container.get(IRequestState))
+        explicit = RequestState()
+        self.assertIs(handler(state=explicit)[1], explicit)
+        self.assertIs(handler(None)[0], None)
+        container.end_scope()
+
+class ICache:
+    pass
+
+class RedisCache(ICache):
+    pass
+
+class MemoryCache(ICache):
+    pass
+
+class ICachedRepository:
+    pass
+
+class CachedRepository(ICachedRepository):
+    def __init__(self, cache: "Annotated[ICache, 'memory']"):
+        self.cache = cache
+
+class KeyedBindingTests(unittest.TestCase):
+    def test_keyed_bindings_coexist_and_resolve_by_key(self):
+        container = DependencyContainer()
+        container.register(ICache, RedisCache, key="redis")
+        container.register(ICache, MemoryCache, key="memory")
+        self.assertIsInstance(container.get(ICache, "memory"), MemoryCache)
+        self.assertIsInstance(container.get(ICache, "redis"), RedisCache)
+        self.assertIsInstance(container.get(ICache), RedisCache)
+        with self.assertRaises(RegistrationError):
+            container.register(ICache, MemoryCache, key="redis")
+        container.register(ICache, MemoryCache, key="redis", override=True)
+        self.assertIsInstance(container.get(ICache, "redis"), MemoryCache)
+        self.assertEqual(len(container.get_all(ICache)), 2)
+        with self.assertRaisesRegex(ConfigurationError, "'redis', 'memory'"):
+            container.get(ICache, "disk")
+
+    @unittest.skipIf(Annotated is None, "requires typing.Annotated")
+    def test_annotated_hints_select_the_key(self):
+        container.register(ICache, RedisCache, key="redis", override=True)
+        container.register(ICache, MemoryCache, key="memory", override=True)
+        container.register(ICachedRepository, CachedRepository, override=True)
+
+        @inject({ICache: "memory"})
+        def handler(default: ICache, redis: Annotated[ICache, "redis"]):
+            return default, redis
+
+        default, redis = handler()
+        self.assertIsInstance(default, MemoryCache)
+        self.assertIsInstance(redis, RedisCache)
+        self.assertIs(container.get(ICachedRepository).cache, default)
+
+    def test_get_all_caches_singleton_fan_out(self):
+        container = DependencyContainer()
+        container.register(IService, ServiceImpl)
+        container.register(IService, TransientService, override=True)
+        plugins = container.get_all(IService)
+        self.assertEqual([type(plugin) for plugin in plugins], [ServiceImpl, TransientService])
+        self.assertIs(container.get_all(IService), plugins)
+        container.register(IService, ScopedService, lifecycle=TRANSIENT, override=True)
+        self.assertIsNot(container.get_all(IService)[2], container.get_all(IService)[2])
+
+class ITenantClient:
+    pass
+
+class TenantClient(ITenantClient):
+    built = 0
+
+    def __init__(self, tenant, repository: IRepository):
+        TenantClient.built += 1
+        self.tenant = tenant
+        self.repository = repository
+
+class ProviderTests(unittest.TestCase):
+    def test_register_instance_is_returned_as_is(self):
+        container = DependencyContainer()
+        repository = Repository()
+        container.register_instance(IRepository, repository)
+        container.register(IUseCase, UseCase)
+        self.assertIs(container.get(IRepository), repository)
+        self.assertIs(container.get(IUseCase).repository, repository)
+        with self.assertRaises(ConfigurationError):
+            container.register_instance(IService, repository, override=True)
+
+    def test_memoized_services_are_cached_per_arguments(self):
+        container = DependencyContainer()
+        container.register(IRepository, Repository)
+        container.register(ITenantClient, TenantClient, lifecycle=MEMOIZED, cache_size=2)
+        TenantClient.built = 0
+        first = container.get(ITenantClient, 0, "a")
+        self.assertIs(container.get(ITenantClient, 0, "a"), first)
+        self.assertIs(container.get(ITenantClient, 0, tenant="b").repository, container.get(IRepository))
+        self.assertEqual(TenantClient.built, 2)
+        container.get(ITenantClient, 0, "c")
+        self.assertIsNot(container.get(ITenantClient, 0, "a"), first)
+        self.assertEqual(TenantClient.built, 4)
+        with self.assertRaises(ConfigurationError):
+            container.get(ITenantClient, 0, ["unhashable"])
+
+    def test_memoized_entries_expire_after_ttl(self):
+        container = DependencyContainer()
+        container.register_factory(ITenantClient, lambda tenant: TenantClient(tenant, Repository()), lifecycle=MEMOIZED, ttl=0.01)
+        first = container.get(ITenantClient, 0, "a")
+        self.assertIs(asyncio.run(container.aget(ITenantClient, 0, "a")), first)
+        time.sleep(0.02)
+        self.assertIsNot(container.get(ITenantClient, 0, "a"), first)
+
+class IUnitOfWork:
+    pass
+
+class UnitOfWork(IUnitOfWork):
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class ScopeObjectTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+        self.container.register(IRequestState, RequestState, lifecycle=SCOPED)
+        self.container.register(IUnitOfWork, UnitOfWork, lifecycle=SCOPED)
+
+    def test_nested_scopes_fall_back_to_their_parent(self):
+        with self.container.scope() as outer:
+            state = self.container.get(IRequestState)
+            with self.container.scope() as inner:
+                self.assertIs(inner.parent, outer)
+                self.assertIs(self.container.get(IRequestState), state)
+                unit_of_work = self.container.get(IUnitOfWork)
+            self.assertTrue(unit_of_work.closed)
+            self.assertIsNot(self.container.get(IUnitOfWork), unit_of_work)
+        self.assertTrue(outer.closed)
+        with self.assertRaises(RuntimeError):
+            self.container.get(IRequestState)
+
+    def test_unclosed_scopes_are_reported_and_collected(self):
+        self.container.start_scope()
+        self.container.get(IRequestState)
+        diagnostics = self.container.scope_diagnostics()
+        self.assertTrue(any(scope["instances"] == 1 and scope["retained_bytes"] > 0 for scope in diagnostics["open"]))
+        leaks = diagnostics["leaked"]["count"]
+        # Starting another scope without ending the first one drops it.
+        self.container.start_scope()
+        gc.collect()
+        self.assertEqual(self.container.scope_diagnostics()["leaked"]["count"], leaks + 1)
+        self.container.end_scope()
+
+    def test_manual_scopes_can_nest(self):
+        container.register(IRequestState, RequestState, lifecycle=SCOPED, override=True)
+        container.register(IUnitOfWork, UnitOfWork, lifecycle=SCOPED, override=True)
+        seen = []
+
+        def inner():
+            seen.append((container.get(IRequestState), container.get(IUnitOfWork)))
+
+        def outer():
+            seen.append((container.get(IRequestState), container.get(IUnitOfWork)))
+            ScoperMiddlewareManual.start(inner)
+            seen.append((container.get(IRequestState), container.get(IUnitOfWork)))
+
+        ScoperMiddlewareManual.start(outer)
+        self.assertEqual(len({id(state) for state, _ in seen}), 1)
+        self.assertEqual(len({id(unit_of_work) for _, unit_of_work in seen}), 1)
+
+class ScopePropagationTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+        self.container.register(IRequestState, RequestState, lifecycle=SCOPED)
+
+    def test_executor_workers_share_the_submitting_scope(self):
+        barrier = threading.Barrier(4)
+
+        def work(_):
+            barrier.wait()
+            return self.container.get(IRequestState)
+
+        with self.container.scope():
+            with ScopedExecutor(ThreadPoolExecutor(max_workers=4), self.container) as executor:
+                states = list(executor.map(work, range(4)))
+            self.assertEqual({id(state) for state in states}, {id(self.container.get(IRequestState))})
+
+    def test_run_in_scope_fails_once_the_scope_has_ended(self):
+        with self.container.scope():
+            work = self.container.run_in_scope(lambda: self.container.get(IRequestState))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with self.assertRaisesRegex(RuntimeError, "has ended"):
+                executor.submit(work).result()
+        self.assertIs(self.container.run_in_scope(work), work)
+
+class LazyImportTests(unittest.TestCase):
+    def test_import_defers_loader_and_discovery(self):
+        statement = ("import sys, injector_api; "
+                     "deferred = [m for m in ('asyncio', 'injector_api.loader', 'injector_api.discovery') if m in sys.modules]; "
+                     "injector_api.inject; print(deferred, 'injector_api.loader' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", statement], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        self.assertEqual(output.strip(), "[] True")
+
+class FakeRepository(IRepository):
+    pass
+
+class ChildContainerTests(unittest.TestCase):
+    def setUp(self):
+        self.parent = DependencyContainer()
+        self.parent.register(IRepository, Repository)
+        self.parent.register(IUseCase, UseCase)
+        self.parent.register(IHandler, Handler, lifecycle=SCOPED)
+        self.parent.register(IService, ServiceImpl)
+
+    def test_child_overrides_are_layered_over_shared_instances(self):
+        child = self.parent.child()
+        service = self.parent.get(IService)
+        self.assertIs(child.get(IService), service)
+        self.assertIs(child.get(IUseCase), self.parent.get(IUseCase))
+
+        child.register(IRepository, FakeRepository)
+        self.assertIsInstance(child.get(IUseCase).repository, FakeRepository)
+        self.assertIsInstance(self.parent.get(IUseCase).repository, Repository)
+        self.assertIs(child.get(IService), service)
+        with self.parent.scope():
+            parent_handler, child_handler = self.parent.get(IHandler), child.get_many([IHandler])[0]
+            self.assertIsNot(parent_handler, child_handler)
+            self.assertIsInstance(child_handler.use_case.repository, FakeRepository)
+            self.assertIs(child.get(IHandler), child_handler)
+
+    def test_child_sees_later_parent_registrations(self):
+        child = self.parent.child()
+        grandchild = child.child()
+        grandchild.register(IService, TransientService, lifecycle=TRANSIENT)
+        self.parent.register(IRequestState, RequestState)
+        self.assertIs(grandchild.get(IRequestState), self.parent.get(IRequestState))
+        self.assertIsInstance(grandchild.get(IService), TransientService)
+        self.assertIsInstance(child.get(IService), ServiceImpl)
+        self.parent.register(IRepository, FakeRepository, key="fake")
+        self.assertIsInstance(grandchild.get(IRepository, "fake"), FakeRepository)
+
+    def test_services_rebuilt_for_a_child_survive_unrelated_registrations(self):
+        child = self.parent.child()
+        child.register(IRepository, FakeRepository)
+        use_case = child.get(IUseCase)
+        self.parent.register(IRequestState, RequestState)
+        child.register(IRequestState, RequestState, key="child")
+        child.enable_instrumentation()
+        self.assertIs(child.get(IUseCase), use_case)
+
+        child.register(IRepository, Repository, key="other")
+        self.assertIs(child.get(IUseCase), use_case)
+        child.register(IRepository, FakeRepository, override=True)
+        self.assertIs(child.get(IUseCase), use_case)
+
+    def test_keyed_override_in_a_child_keeps_the_other_keys(self):
+        self.parent.register(IService, TransientService, key="redis")
+        self.parent.register(IService, TransientService, key="memory")
+        child = self.parent.child()
+        child.register(IService, ServiceImpl, key="redis")
+        self.assertIsInstance(child.get(IService, "redis"), ServiceImpl)
+        self.assertIsInstance(self.parent.get(IService, "redis"), TransientService)
+        self.assertIs(child.get(IService, "memory"), self.parent.get(IService, "memory"))
+        self.assertIs(child.get(IService), self.parent.get(IService))
+        self.assertEqual([type(service) for service in child.get_all(IService)], [ServiceImpl, ServiceImpl, TransientService])
+
+    def test_frozen_child_follows_parent_registrations(self):
+        self.parent.register(IService, TransientService, key="k")
+        child = self.parent.child()
+        child.freeze()
+        self.assertIsInstance(child.get(IService, "k"), TransientService)
+        self.parent.register(IService, ServiceImpl, key="k", override=True)
+        self.assertIsInstance(child.get(IService, 1), ServiceImpl)
+        self.assertIs(child.get(IService, "k"), child.get(IService, 1))
+        self.assertIs(child.get(IService, "k"), self.parent.get(IService, "k"))
+        self.assertIn("k", child._keyed_table[IService])
+
+class IGeoIndex:
+    pass
+
+class GeoIndex(IGeoIndex):
+    def __init__(self):
+        time.sleep(0.02)
+
+class IRouter:
+    pass
+
+class Router(IRouter):
+    def __init__(self, index: IGeoIndex):
+        time.sleep(0.01)
+        self.index = index
+
+class IConfigFetcher:
+    pass
+
+class ConfigFetcher(IConfigFetcher):
+    def __init__(self):
+        time.sleep(0.015)
+
+class DependencyGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.container = DependencyContainer()
+        self.container.register(IGeoIndex, GeoIndex)
+        self.container.register(IRouter, Router)
+        self.container.register(IConfigFetcher, ConfigFetcher)
+        self.container.register(IHandler, Handler, lifecycle=TRANSIENT)
+
+    def test_graph_reports_the_measured_critical_path(self):
+        self.container.enable_instrumentation()
+        self.container.get(IRouter)
+        self.container.get(IConfigFetcher)
+        graph = self.container.dependency_graph()
+        path, seconds = graph.critical_path()
+        self.assertEqual([binding.interface for binding in path], [IRouter, IGeoIndex])
+        self.assertGreaterEqual(seconds, 0.03)
+        self.assertLess(graph.self_time(path[0]), 0.02)
+
+        data = graph.as_dict()
+        router, geo_index = f"{__name__}.IRouter[0]", f"{__name__}.IGeoIndex[0]"
+        self.assertIn({"from": router, "to": geo_index, "parameter": "index"}, data["edges"])
+        self.assertEqual(data["critical_path"]["nodes"], [router, geo_index])
+        self.assertGreaterEqual(data["eager_ms"], 45)
+        self.assertIn(f'"{router}" -> "{geo_index}" [label="index", color=red', graph.to_dot())
+        self.assertIn("IRouter[0] -> Router", graph.report())
+
+    def test_graph_keeps_interfaces_with_the_same_name_apart(self):
+        other = types.ModuleType("other_package.interfaces")
+        exec("class IRouter:\n    pass\nclass Router(IRouter):\n    pass\n", other.__dict__)
+        self.container.register(other.IRouter, other.Router)
+        data = self.container.dependency_graph().as_dict()
+        ids = [node["id"] for node in data["nodes"] if node["interface"] == "IRouter"]
+        self.assertEqual(sorted(ids), sorted([f"{__name__}.IRouter[0]", "other_package.interfaces.IRouter[0]"]))
+
+    def test_cli_exports_the_graph_of_module_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        os.makedirs(os.path.join(directory, "geo"))
+        with open(os.path.join(directory, "geo", "module.py"), "w") as f:
+            f.write("from injector_api import container\nfrom test.test import IGeoIndex, GeoIndex, IRouter, Router\n"
+                    "container.register(IGeoIndex, GeoIndex)\ncontainer.register(IRouter, Router)\n")
+        output = subprocess.run([sys.executable, "-m", "injector_api", "graph", directory, "--format", "json", "--measure"],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        data = json.loads(output)
+        self.assertEqual([node["label"] for node in data["nodes"] if node["id"] in data["critical_path"]["nodes"]],
+                         ["IGeoIndex[0]", "IRouter[0]"])
+        self.assertEqual(data["critical_path"]["nodes"], ["test.test.IRouter[0]", "test.test.IGeoIndex[0]"])
+        self.assertTrue(all(node["constructions"] == 1 for node in data["nodes"]))
+
+INIT_BARRIER = threading.Barrier(2, timeout=5)
+
+class IModelStore:
+    pass
+
+class ModelStore(IModelStore):
+    def __init__(self):
+        INIT_BARRIER.wait()
+
+class IFeatureFlags:
+    pass
+
+class FeatureFlags(IFeatureFlags):
+    def __init__(self):
+        INIT_BARRIER.wait()
+
+class IRanker:
+    pass
+
+class Ranker(IRanker):
+    def __init__(self, models: IModelStore, flags: IFeatureFlags, handler: IHandler):
+        self.models = models
+        self.flags = flags
+
+class BrokenFlags(IFeatureFlags):
+    def __init__(self):
+        raise ValueError("flags unavailable")
+
+async def fetch_config():
+    await asyncio.sleep(0)
+    return {"region": "eu"}
+
+class InitializeAllTests(unittest.TestCase):
+    def setUp(self):
+        INIT_BARRIER.reset()
+        self.container = DependencyContainer()
+        self.container.register(IRanker, Ranker)
+        self.container.register(IHandler, Handler, lifecycle=TRANSIENT)
+        self.container.register(IUseCase, UseCase)
+        self.container.register(IRepository, Repository)
+        self.container.register(IModelStore, ModelStore)
+        self.container.register(IFeatureFlags, FeatureFlags)
+
+    def test_independent_singletons_are_built_concurrently_in_dependency_order(self):
+        # ModelStore and FeatureFlags only get past the barrier when they are built at the same time.
+        instances = self.container.initialize_all(parallel=True, workers=4)
+        ranker = self.container.get(IRanker)
+        self.assertIs(instances[0], ranker)
+        self.assertIs(ranker.models, self.container.get(IModelStore))
+        self.assertIs(self.container.get(IUseCase).repository, self.container.get(IRepository))
+
+    def test_failures_are_reported_together(self):
+        container = DependencyContainer()
+        container.register(IRanker, Ranker)
+        container.register(IHandler, Handler, lifecycle=TRANSIENT)
+        container.register(IUseCase, UseCase)
+        container.register(IRepository, Repository)
+        container.register(IFeatureFlags, BrokenFlags)
+        container.register_factory(IModelStore, lambda: {}["models"])
+        with self.assertRaises(InitializationError) as caught:
+            container.initialize_all()
+        failures = {binding.interface: type(error) for binding, error in caught.exception.errors}
+        self.assertEqual(failures, {IFeatureFlags: ValueError, IModelStore: KeyError})
+        self.assertEqual([binding.interface for binding in caught.exception.skipped], [IRanker])
+        self.assertIsInstance(container.get(IUseCase), UseCase)
+        self.assertIn("flags unavailable", str(caught.exception))
+
+    def test_async_factories_are_initialized_as_tasks(self):
+        container = DependencyContainer()
+        container.register_factory(IConfigFetcher, fetch_config)
+        container.register(IRepository, Repository)
+        config, repository = asyncio.run(container.ainitialize_all())
+        self.assertEqual(config, {"region": "eu"})
+        self.assertIs(repository, container.get(IRepository))
+
+class IReloadClock:
+    pass
+
+class IReloadReport:
+    pass
+
+class ReloadReport(IReloadReport):
+    def __init__(self, clock: IReloadClock):
+        self.clock = clock
+
+class IReloadCache:
+    pass
+
+class ReloadCache(IReloadCache):
+    pass
+
+class IReloadOrder:
+    pass
+
+class OrderA(IReloadOrder):
+    pass
+
+class OrderB(IReloadOrder):
+    pass
+
+class OrderC(IReloadOrder):
+    pass
+
+class IReloadThread:
+    pass
+
+class IReloadConfig:
+    pass
+
+RELOAD_CONFIG = IReloadConfig()
+
+RELOAD_MODULES = {
+    "clock": "from test.test import container, IReloadClock\n"
+             "class Clock(IReloadClock):\n    VERSION = {version}\n"
+             "container.register(IReloadClock, Clock)\n",
+    "report": "from test.test import container, IReloadReport, ReloadReport\n"
+              "container.register(IReloadReport, ReloadReport)\n",
+    "cache": "from test.test import container, IReloadCache, ReloadCache\n"
+             "container.register(IReloadCache, ReloadCache)\n",
+    "order_a": "from test.test import container, IReloadOrder, OrderA, OrderC\n"
+               "container.register(IReloadOrder, OrderA)\n{extra}",
+    "order_b": "from test.test import container, IReloadOrder, OrderB\n"
+               "container.register(IReloadOrder, OrderB, override=True)\n",
+    "config": "from test.test import container, IReloadConfig, RELOAD_CONFIG\n"
+              "container.register_instance(IReloadConfig, RELOAD_CONFIG)\n{extra}",
+}
+
+class HotReloadTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for app in RELOAD_MODULES:
+            os.makedirs(os.path.join(self.root, app))
+            self.write(app, version=1, extra="")
+        load_modules_from_subdirectories(self.root, use_cache=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        diff = container.reload(self.root)
+        self.assertGreaterEqual(len(diff["removed"]), 5)
+        self.assertNotIn(IReloadClock, container._services)
+        self.assertNotIn(IReloadOrder, container._services)
+
+    def write(self, app, **values):
+        with open(os.path.join(self.root, app, "module.py"), "w") as f:
+            f.write(RELOAD_MODULES[app].format(**values))
+
+    def test_reload_rebuilds_only_the_affected_singletons(self):
+        report, cache = container.get(IReloadReport), container.get(IReloadCache)
+        self.assertEqual(report.clock.VERSION, 1)
+        self.assertEqual(container.reload(self.root)["modules"], [])
+
+        self.write("clock", version=22)
+        diff = container.reload(self.root)
+        self.assertEqual([binding.interface for binding in diff["added"]], [IReloadClock])
+        self.assertEqual([binding.interface for binding in diff["rebuilt"]], [IReloadReport])
+        self.assertEqual(container.get(IReloadReport).clock.VERSION, 22)
+        self.assertIsNot(container.get(IReloadReport), report)
+        self.assertIs(container.get(IReloadCache), cache)
+
+    def test_loading_changed_modules_again_replaces_their_registrations(self):
+        self.write("clock", version=3)
+        with open(os.path.join(self.root, "order_b", "module.py"), "a") as f:
+            f.write("# changed\n")
+        load_modules_from_subdirectories(self.root, use_cache=False)
+        self.assertEqual(len(container._services[IReloadClock]), 1)
+        self.assertEqual(container.get(IReloadClock).VERSION, 3)
+        self.assertEqual([type(container.get(IReloadOrder, index)) for index in range(2)], [OrderA, OrderB])
+        self.assertEqual(len(container._services[IReloadOrder]), 2)
+
+    def test_reload_keeps_the_registration_order(self):
+        self.write("order_a", extra="container.register(IReloadOrder, OrderC, override=True)\n")
+        container.reload(self.root)
+        self.assertEqual([type(container.get(IReloadOrder, index)) for index in range(3)], [OrderA, OrderC, OrderB])
+
+    def test_reloaded_registrations_are_checked_like_register(self):
+        bindings = container._services[IReloadOrder]
+        self.write("order_a", extra="container.register(IReloadOrder, OrderC)\n")
+        with self.assertRaises(RegistrationError):
+            container.reload(self.root)
+        self.assertIs(container._services[IReloadOrder], bindings)
+        self.write("order_a", extra="")
+        self.assertEqual(container.reload(self.root)["added"], [])
+        self.assertIs(container._services[IReloadOrder], bindings)
+
+    def test_reloading_an_unchanged_instance_keeps_its_binding(self):
+        bindings = container._services[IReloadConfig]
+        self.write("config", extra="# changed\n")
+        diff = container.reload(self.root)
+        self.assertEqual(diff["modules"], [os.path.join(self.root, "config", "module.py")])
+        self.assertEqual(diff["added"], [])
+        self.assertIs(container._services[IReloadConfig], bindings)
+        self.assertIs(container.get(IReloadConfig), RELOAD_CONFIG)
+
+    def test_other_threads_register_normally_while_a_reload_is_staged(self):
+        container._begin_staging()
+        try:
+            worker = threading.Thread(target=container.register, args=(IReloadThread, IReloadThread))
+            worker.start()
+            worker.join()
+        finally:
+            container._abort_staging()
+        self.assertIn(IReloadThread, container._services)
+
+    def test_failed_reload_keeps_the_registry(self):
+        clock = container.get(IReloadClock)
+        with open(os.path.join(self.root, "clock", "module.py"), "w") as f:
+            f.write("raise RuntimeError('broken')\n")
+        with self.assertRaises(ImportError):
+            container.reload(self.root)
+        self.assertIs(container.get(IReloadClock), clock)
+        with self.assertRaises(ConfigurationError):
+            DependencyContainer().reload(self.root)
+
+class IForkClient:
+    pass
+
+class ForkClient(IForkClient):
+    pass
+
+class ForkTests(unittest.TestCase):
+    def test_warmup_builds_eager_fork_safe_singletons(self):
+        container = DependencyContainer()
+        container.register(IRepository, Repository)
+        container.register(IUseCase, UseCase)
+        container.register(IForkClient, ForkClient, fork_safe=False)
+        container.register(IService, TransientService, lifecycle=TRANSIENT)
+        warmed = container.warmup()
+        self.assertEqual(sorted(type(instance).__name__ for instance in warmed), ["Repository", "UseCase"])
+        self.assertIs(container.get(IUseCase).repository, warmed[0])
+        self.assertIsInstance(container.warmup(IForkClient)[0], ForkClient)
+
+    def test_warmup_leaves_async_factories_to_aget(self):
+        container = DependencyContainer()
+        container.register(IRepository, Repository)
+
+        async def open_client():
+            return ForkClient()
+
+        container.register_factory(IForkClient, open_client)
+        self.assertEqual([type(instance) for instance in container.warmup()], [Repository])
+        self.assertIsInstance(asyncio.run(container.aget(IForkClient)), ForkClient)
+
+    def test_reset_after_fork_drops_fork_unsafe_instances(self):
+        container = DependencyContainer()
+        container.register(IRepository, Repository)
+        container.register(IForkClient, ForkClient, fork_safe=False, lazy=True)
+        repository, client = container.warmup(IRepository, IForkClient)
+        container.start_scope()
+        container.reset_after_fork()
+        self.assertIs(container.get(IRepository), repository)
+        self.assertIsNot(container.get(IForkClient), client)
+        container.end_scope()
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_forked_child_rebuilds_fork_unsafe_instances(self):
+        container = DependencyContainer()
+        container.register(IRepository, Repository)
+        container.register(IForkClient, ForkClient, fork_safe=False)
+        repository, client = container.warmup(IRepository, IForkClient)
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            same = (container.get(IRepository) is repository, container.get(IForkClient) is client)
+            os.write(write, json.dumps(same).encode())
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as f:
+            result = json.load(f)
+        os.waitpid(pid, 0)
+        self.assertEqual(result, [True, False])
+        self.assertIs(container.get(IForkClient), client)
+
 if __name__ == "__main__":
     unittest.main()